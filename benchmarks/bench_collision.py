@@ -0,0 +1,103 @@
+# Micro-benchmark for the collision check used by shift_piece, legal_placements and best_move
+# Compares the old full-grid scan against the indexed checks on every board size
+# Run from the project folder: python benchmarks/bench_collision.py
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic.config as config
+from logic.board import Board
+from model import fetch_random_tetromino, get_tetromino_positions, is_position_valid
+
+BOARD_SIZES = [(20, 10), (16, 8), (20, 15)]
+CALLS = 20000
+
+
+def legacy_is_position_valid(tetromino, grid):
+    """ The collision check as it was before the board was indexed, kept as the baseline. """
+    accepted_positions = []
+
+    max_x = config.COLS - 1
+    max_y = config.ROWS - 1
+
+    for i in range(config.ROWS):
+        for j in range(config.COLS):
+            if grid[i][j] == config.EMPTY_CELL:
+                accepted_positions.append((j, i))
+
+    tetromino_positions = get_tetromino_positions(tetromino)
+
+    for pos in tetromino_positions:
+        x, y = pos
+        if x < 0 or x > max_x:
+            return False
+        if y > max_y:
+            return False
+
+    for position in tetromino_positions:
+        x, y = position
+        if y > -1 and position not in accepted_positions:
+            return False
+
+    return True
+
+
+def build_half_full_board(rows, cols, rng):
+    """ Fill the bottom half of the board with random blocks, leaving a gap in every row. """
+    board = Board(rows, cols)
+    for y in range(rows // 2, rows):
+        gap = rng.randrange(cols)
+        board.lock([(x, y) for x in range(cols) if x != gap and rng.random() < 0.7], (128, 128, 128))
+    return board
+
+
+def build_pieces(rows, cols, rng, count=200):
+    """ Create pieces scattered over the board so both valid and invalid positions are checked. """
+    pieces = []
+    for _ in range(count):
+        piece = fetch_random_tetromino()
+        piece.x_pos = rng.randrange(-1, cols + 2)
+        piece.y_pos = rng.randrange(0, rows + 3)
+        piece.spin = rng.randrange(4)
+        pieces.append(piece)
+    return pieces
+
+
+def measure(check, pieces, grid):
+    """ Return the number of calls per second of the given collision check. """
+    def run():
+        for piece in pieces:
+            check(piece, grid)
+
+    repeats = max(1, CALLS // len(pieces))
+    seconds = min(timeit.repeat(run, number=repeats, repeat=3))
+    return repeats * len(pieces) / seconds
+
+
+def main():
+    rng = random.Random(19)
+    print(f"{'board':>8} {'legacy grid':>14} {'indexed grid':>14} {'board':>14}   (calls per second)")
+    for rows, cols in BOARD_SIZES:
+        config.ROWS, config.COLS = rows, cols
+        board = build_half_full_board(rows, cols, rng)
+        grid = board.to_grid()
+        pieces = build_pieces(rows, cols, rng)
+
+        # Every implementation has to agree before the timings mean anything
+        for piece in pieces:
+            expected = legacy_is_position_valid(piece, grid)
+            assert is_position_valid(piece, grid) == expected
+            assert is_position_valid(piece, board) == expected
+
+        legacy = measure(legacy_is_position_valid, pieces, grid)
+        indexed = measure(is_position_valid, pieces, grid)
+        bitboard = measure(is_position_valid, pieces, board)
+        print(f"{rows:>5}x{cols:<2} {legacy:>14,.0f} {indexed:>14,.0f} {bitboard:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
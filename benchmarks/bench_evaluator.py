@@ -0,0 +1,108 @@
+# Benchmark for the evaluator behind the AI decision made once per piece by best_move
+# Compares scoring every candidate board one at a time against the NumPy batch evaluator on every board size
+# Both score the straight drops of possible_moves, so only the evaluators are compared
+# The transposition table is switched off so every board is scored
+# Run from the project folder: python benchmarks/bench_evaluator.py
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.board import Board
+from logic.engine import create_random_tetromino, get_tetromino_positions, is_position_valid, shift_piece
+from logic.ai import best_move, legal_placements, possible_moves
+from logic.evaluator import score_board, evaluate_placements, np
+
+BOARD_SIZES = [(20, 10), (16, 8), (20, 15)]
+WEIGHTS = [1000, 500, 100, 300]
+DECISIONS = 20
+
+
+def legacy_best_move(current_piece, grid, weights):
+    """ best_move as it was before the batch evaluator, copying the grid and scoring each candidate on its own. """
+    moves = possible_moves(current_piece, grid)
+    if not moves:
+        return None, {}
+
+    evaluations = {}
+    for move in moves:
+        test_piece = current_piece.copy()
+        test_grid = [row.copy() for row in grid]
+
+        rotation, x_position = move
+        for _ in range(rotation):
+            shift_piece(test_piece, test_grid, "ROTATE")
+        test_piece.x_pos = x_position
+
+        while is_position_valid(test_piece, test_grid):
+            test_piece.y_pos += 1
+        test_piece.y_pos -= 1
+
+        for x, y in get_tetromino_positions(test_piece):
+            if y > -1:
+                test_grid[y][x] = test_piece.colour
+
+        evaluations[move] = score_board(test_grid, weights)
+
+    return max(evaluations, key=evaluations.get), evaluations
+
+
+def batch_best_move(current_piece, grid, weights):
+    """ Pick the best straight drop with the batch evaluator, the way best_move scores its placements. """
+    placements = legal_placements(current_piece, grid)
+    scores = evaluate_placements(grid, [positions for _, positions in placements], weights, table=None)
+    return placements[max(range(len(placements)), key=scores.__getitem__)][0]
+
+
+def build_half_full_grid(rows, cols, rng):
+    """ Fill the bottom half of the board with random blocks, leaving a gap in every row. """
+    board = Board(rows, cols)
+    for y in range(rows // 2, rows):
+        gap = rng.randrange(cols)
+        board.lock([(x, y) for x in range(cols) if x != gap and rng.random() < 0.7], (128, 128, 128))
+    return board.to_grid()
+
+
+def main():
+    if np is None:
+        print("NumPy is not installed, best_move is using the one board at a time evaluator")
+
+    rng = random.Random(19)
+    print(f"{'board':>8} {'legacy ms':>12} {'batch ms':>12} {'speed-up':>10}   (per decision)")
+    for rows, cols in BOARD_SIZES:
+        grid = build_half_full_grid(rows, cols, rng)
+        pieces = [create_random_tetromino(rng, cols) for _ in range(DECISIONS)]
+
+        # Both evaluators have to give the same scores and pick the same move
+        for piece in pieces:
+            expected_move, expected_scores = legacy_best_move(piece, grid, WEIGHTS)
+            assert batch_best_move(piece, grid, WEIGHTS) == expected_move
+            # best_move also searches the places under overhangs, so it never does worse than a straight drop
+            placement = best_move(piece, grid, WEIGHTS, table=None)
+            score = evaluate_placements(grid, [placement.positions], WEIGHTS, table=None)[0]
+            assert score >= expected_scores[expected_move]
+            moves = list(expected_scores)
+            placements = []
+            for rotation, x_position in moves:
+                test_piece = piece.copy()
+                for _ in range(rotation):
+                    shift_piece(test_piece, grid, "ROTATE")
+                test_piece.x_pos = x_position
+                while is_position_valid(test_piece, grid):
+                    test_piece.y_pos += 1
+                test_piece.y_pos -= 1
+                placements.append(get_tetromino_positions(test_piece))
+            assert evaluate_placements(grid, placements, WEIGHTS, table=None) == [expected_scores[move] for move in moves]
+
+        legacy = min(timeit.repeat(lambda: [legacy_best_move(p, grid, WEIGHTS) for p in pieces], number=1, repeat=3))
+        batch = min(timeit.repeat(lambda: [batch_best_move(p, grid, WEIGHTS) for p in pieces], number=1, repeat=3))
+        legacy_ms = legacy / DECISIONS * 1000
+        batch_ms = batch / DECISIONS * 1000
+        print(f"{rows:>5}x{cols:<2} {legacy_ms:>12.2f} {batch_ms:>12.2f} {legacy_ms / batch_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# pytest-benchmark suite for the hot paths of model.py and the AI
+# Each function is timed on every seeded board from conftest.py, so a slowdown shows up as a number for one
+# function, board size and fill level. Save and compare JSON baselines with the commands in conftest.py
+# The transposition table is switched off so the AI benchmarks time the search, not cached scores
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from model import (TetrominoFactory, best_move, evaluate_board, generate_game_grid, get_tetromino_positions,
+                   is_position_valid, legal_placements, possible_moves, reachable_placements, remove_full_rows,
+                   shift_piece)
+
+WEIGHTS = [1000, 500, 100, 300]
+DIRECTIONS = ("LEFT", "RIGHT", "DOWN", "ROTATE")
+
+
+def copy_pieces(pieces):
+    return [piece.copy() for piece in pieces]
+
+
+@pytest.mark.benchmark(group='generate_game_grid')
+def test_generate_game_grid(benchmark, case):
+    grid = benchmark(generate_game_grid, case.board)
+    assert grid == case.grid
+
+
+@pytest.mark.benchmark(group='is_position_valid')
+def test_is_position_valid(benchmark, case):
+    def check_pieces():
+        return [is_position_valid(piece, case.board) for piece in case.pieces]
+
+    results = benchmark(check_pieces)
+    assert results == [is_position_valid(piece, case.grid) for piece in case.pieces]
+
+
+@pytest.mark.benchmark(group='get_tetromino_positions')
+def test_get_tetromino_positions(benchmark, case):
+    def find_positions():
+        return [get_tetromino_positions(piece) for piece in case.pieces]
+
+    positions = benchmark(find_positions)
+    assert all(len(cells) == 4 for cells in positions)
+
+
+@pytest.mark.benchmark(group='shift_piece')
+@pytest.mark.parametrize('direction', DIRECTIONS)
+def test_shift_piece(benchmark, case, direction):
+    def shift_pieces(pieces):
+        for piece in pieces:
+            shift_piece(piece, case.board, direction)
+
+    # Pieces move, so every round starts from fresh copies made outside the timing
+    benchmark.pedantic(shift_pieces, setup=lambda: ((copy_pieces(case.pieces),), {}), rounds=200)
+
+
+@pytest.mark.benchmark(group='remove_full_rows')
+def test_remove_full_rows(benchmark, case):
+    full_rows = len(case.full_board.full_rows())
+
+    # Clearing changes the board, so every round clears a fresh copy made outside the timing
+    score = benchmark.pedantic(remove_full_rows, setup=lambda: ((case.grid, case.full_board.copy(), True), {}),
+                               rounds=200)
+    assert full_rows and score > 0
+
+
+@pytest.mark.benchmark(group='evaluate_board')
+def test_evaluate_board(benchmark, case):
+    benchmark(evaluate_board, case.grid, WEIGHTS, None)
+
+
+@pytest.mark.benchmark(group='possible_moves')
+def test_possible_moves(benchmark, case):
+    def find_moves():
+        return [possible_moves(piece, case.grid) for piece in case.spawn_pieces]
+
+    moves = benchmark(find_moves)
+    assert all(moves)
+
+
+@pytest.mark.benchmark(group='best_move')
+def test_best_move(benchmark, case):
+    def choose_moves():
+        return [best_move(piece, case.grid, WEIGHTS, None) for piece in case.spawn_pieces]
+
+    moves = benchmark(choose_moves)
+    assert all(moves)
+
+
+@pytest.mark.benchmark(group='reachable_placements')
+def test_reachable_placements(benchmark, case):
+    def search_pieces():
+        return [reachable_placements(piece, case.board) for piece in case.spawn_pieces]
+
+    placements = benchmark(search_pieces)
+    # Every path takes its piece to the place it locks in, one it cannot move down from
+    for piece, piece_placements in zip(case.spawn_pieces, placements):
+        assert piece_placements
+        for placement in piece_placements:
+            test_piece = piece.copy()
+            for action in placement.path:
+                shift_piece(test_piece, case.board, action)
+            assert get_tetromino_positions(test_piece) == placement.positions
+            test_piece.y_pos += 1
+            assert not is_position_valid(test_piece, case.board)
+
+
+@pytest.mark.benchmark(group='best_move')
+def test_best_move_under_overhang(benchmark, overhang_board):
+    piece = TetrominoFactory.create_tetromino('I', overhang_board.cols // 2, 0)
+    placement = benchmark(best_move, piece, overhang_board, WEIGHTS, None)
+
+    # The I piece slides under the roof to clear the bottom row, no straight drop gets there
+    assert all(y > overhang_board.column_tops[x] for x, y in placement.positions)
+    assert placement.positions not in [positions for _, positions in legal_placements(piece, overhang_board)]
@@ -0,0 +1,97 @@
+# Memory benchmark for the tetromino pieces, measured with tracemalloc
+# Compares the size of a slotted piece against the old dict-backed one, then traces a 1,000 piece AI game
+# Run from the project folder: python benchmarks/bench_memory.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.ai import best_move, possible_moves
+from logic.engine import TetrisEngine
+from logic.tetromino import Tetromino, TetrominoFactory
+
+WEIGHTS = [1000, 500, 100, 300]
+ROWS, COLS = 20, 10
+PIECES = 1000
+INSTANCES = 10000
+
+
+class LegacyTetromino:
+    """ The piece as it was before it was slotted, every instance carries its own attribute dict. """
+
+    def __init__(self, x_pos, y_pos, shape, colour, rotations=None, name=None):
+        self.spin = 0
+        self.name = name
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+        self.shape = shape
+        self.colour = colour
+        self.rotations = rotations
+
+
+def traced_bytes(create):
+    """ Return the memory held by INSTANCES objects made by create. """
+    tracemalloc.start()
+    objects = [create() for _ in range(INSTANCES)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / INSTANCES
+
+
+def play_traced_game():
+    """ Play PIECES pieces with best_move (starting new games as needed) and return the trace results. """
+    copies = 0
+    candidates = 0
+    original_copy = Tetromino.copy
+
+    def counting_copy(piece):
+        nonlocal copies
+        copies += 1
+        return original_copy(piece)
+
+    Tetromino.copy = counting_copy
+    placed = 0
+    seed = 0
+    start_time = time.perf_counter()
+    tracemalloc.start()
+    try:
+        while placed < PIECES:
+            engine = TetrisEngine(ROWS, COLS, seed=seed)
+            while not engine.game_over and placed < PIECES:
+                candidates += len(possible_moves(engine.current_piece, engine.board))
+                move = best_move(engine.current_piece, engine.board, WEIGHTS, table=None)
+                if move is None:
+                    break
+                engine.play_path(move.path)
+                placed += 1
+            seed += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        Tetromino.copy = original_copy
+    # possible_moves was called once more per piece above just to count the candidates
+    copies -= placed
+    return placed, copies, candidates, peak, time.perf_counter() - start_time
+
+
+def main():
+    shape_class = TetrominoFactory.tetromino_classes['T']
+    slotted = traced_bytes(lambda: Tetromino(shape_class.SHAPE_ID, 5, 0))
+    legacy = traced_bytes(lambda: LegacyTetromino(5, 0, shape_class.SHAPES, shape_class.COLOUR,
+                                                  shape_class.ROTATIONS, 'T'))
+    print(f"bytes per piece: legacy {legacy:.0f}, slotted {slotted:.0f} ({legacy / slotted:.1f}x smaller)")
+
+    placed, copies, candidates, peak, seconds = play_traced_game()
+    # The old search copied the piece once for every move it checked and again for every valid move
+    legacy_copies = 4 * (COLS + 2) * placed + candidates
+    print(f"{placed} piece AI game: peak traced memory {peak / 1024:.0f} KiB, {seconds:.1f} s (traced)")
+    print(f"piece copies: {copies} ({copies / placed:.1f} per piece), "
+          f"the per-move copies would have made about {legacy_copies:.0f} ({legacy_copies / placed:.0f} per piece)")
+
+
+if __name__ == "__main__":
+    main()
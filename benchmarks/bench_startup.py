@@ -0,0 +1,64 @@
+# Startup benchmark, measures the time from a fresh interpreter to the first frames the player sees
+# Every run starts a new Python process so nothing is cached between runs
+# Run from the project folder: python benchmarks/bench_startup.py [--runs 5] [--headless]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process and prints the seconds since it started at every stage as JSON
+CHILD_SCRIPT = """
+import json, time
+start = time.perf_counter()
+times = {}
+
+import view
+times['import view'] = time.perf_counter() - start
+
+view.init_view()
+view.draw_start_screen()
+times['start screen frame'] = time.perf_counter() - start
+
+import pygame
+import logic.config as config
+from controller import Tetris
+window = pygame.display.set_mode((config.window_w, config.window_h))
+game = Tetris(window, config.FAST_GAME)
+game.game_cycle()
+times['first game frame'] = time.perf_counter() - start
+
+print(json.dumps(times))
+"""
+
+
+def run_once(headless):
+    environment = dict(os.environ)
+    if headless:
+        environment['SDL_VIDEODRIVER'] = 'dummy'
+        environment['SDL_AUDIODRIVER'] = 'dummy'
+    environment['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    output = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=PROJECT_DIR, env=environment,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the time to the first frame of the menu and of a game.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--headless', action='store_true', help="use the dummy video and audio drivers")
+    args = parser.parse_args()
+
+    runs = [run_once(args.headless) for _ in range(args.runs)]
+    print(f"{'stage':>20} {'median ms':>10} {'min ms':>10}   ({args.runs} runs)")
+    for stage in runs[0]:
+        times = [run[stage] * 1000 for run in runs]
+        print(f"{stage:>20} {statistics.median(times):>10.1f} {min(times):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
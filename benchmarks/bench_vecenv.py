@@ -0,0 +1,90 @@
+# Benchmark for batch AI rollouts
+# Plays random legal moves on every board size with one TetrisEngine per game and with VecTetrisEnv,
+# after checking that both give the same boards and scores for the same seeds
+# Run from the project folder: python benchmarks/bench_vecenv.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from logic.ai import possible_moves
+from logic.engine import TetrisEngine
+from logic.vecenv import VecTetrisEnv
+
+BOARD_SIZES = [(20, 10), (16, 8), (20, 15)]
+GAMES = 1024
+STEPS = 200
+
+
+def random_actions(env, rng):
+    """ Pick a random legal action for every game that is still running. """
+    legal = env.legal_actions()
+    return np.argmax(rng.random(legal.shape) * legal, axis=1)
+
+
+def check_against_engine(rows, cols, extended, games=16, steps=100):
+    """ Play the same moves on TetrisEngines with the seeds of the env's games and compare the results. """
+    env = VecTetrisEnv(games, rows, cols, extended, seed=19)
+    engines = [TetrisEngine(rows, cols, extended, seed=seed) for seed in env.seeds]
+    rng = np.random.default_rng(19)
+    for _ in range(steps):
+        legal = env.legal_actions()
+        actions = random_actions(env, rng)
+        for k, engine in enumerate(engines):
+            if env.dones[k]:
+                continue
+            moves = possible_moves(engine.current_piece, engine.board)
+            assert sorted(rotation * env.columns + x for rotation, x in moves) == list(np.flatnonzero(legal[k]))
+            engine.place(*divmod(int(actions[k]), env.columns))
+        env.step(actions)
+    for k, engine in enumerate(engines):
+        assert engine.board.pack() == sum(int(bit) << (y * cols + x)
+                                          for (y, x), bit in np.ndenumerate(env.observe().boards[k]))
+        assert (engine.score, engine.pieces_placed, engine.game_over) == \
+               (env.scores[k], env.pieces_placed[k], env.dones[k])
+
+
+def engine_placements_per_second(rows, cols, extended):
+    rng = np.random.default_rng(19)
+    engines = [TetrisEngine(rows, cols, extended, seed=seed) for seed in range(GAMES // 16)]
+    placements = 0
+    start_time = time.perf_counter()
+    for _ in range(STEPS):
+        for engine in engines:
+            if engine.game_over:
+                engine.reset()
+            moves = possible_moves(engine.current_piece, engine.board)
+            engine.place(*moves[rng.integers(len(moves))])
+            placements += 1
+    return placements / (time.perf_counter() - start_time)
+
+
+def env_placements_per_second(rows, cols, extended):
+    rng = np.random.default_rng(19)
+    env = VecTetrisEnv(GAMES, rows, cols, extended, seed=19)
+    placements = 0
+    start_time = time.perf_counter()
+    for _ in range(STEPS):
+        running = GAMES - int(env.dones.sum())
+        _, _, dones = env.step(random_actions(env, rng))
+        placements += running
+        if dones.any():
+            env.reset(np.flatnonzero(dones))
+    return placements / (time.perf_counter() - start_time)
+
+
+def main():
+    print(f"{'board':>8} {'extended':>9} {'TetrisEngine':>14} {'VecTetrisEnv':>14}   (placements per second)")
+    for rows, cols in BOARD_SIZES:
+        for extended in (False, True):
+            check_against_engine(rows, cols, extended)
+            engine = engine_placements_per_second(rows, cols, extended)
+            env = env_placements_per_second(rows, cols, extended)
+            print(f"{rows:>5}x{cols:<2} {str(extended):>9} {engine:>14,.0f} {env:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Fixtures for the pytest-benchmark suite in bench_hot_paths.py
+# Every benchmark runs on the same seeded boards: the three board sizes, each mostly empty, half full and near death
+#
+# Run from the project folder (needs pytest-benchmark: pip install pytest-benchmark):
+#   python -m pytest benchmarks                                  time every hot path
+#   python -m pytest benchmarks --benchmark-save=baseline        save the results as a JSON baseline in .benchmarks
+#   python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+#                                                                compare with the latest baseline, fail on a 10% slowdown
+#   pytest-benchmark compare --group-by=name                     list the saved baselines side by side
+
+import os
+import sys
+import random
+from collections import namedtuple
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.board import Board
+from logic.randomiser import piece_names
+from logic.tetromino import TetrominoFactory
+
+BOARD_SIZES = [(20, 10), (16, 8), (20, 15)]
+# Fill level: fraction of the rows, from the bottom, that hold blocks
+FILLS = {'empty': 0.15, 'half': 0.5, 'near-death': 0.85}
+COLOURS = [(0, 255, 0), (255, 0, 0), (0, 255, 255), (255, 255, 0), (255, 165, 0), (0, 0, 255), (128, 0, 128)]
+SEED = 19
+
+BoardCase = namedtuple('BoardCase', ['rows', 'cols', 'fill', 'board', 'grid', 'full_board', 'pieces',
+                                     'spawn_pieces'])
+
+
+def build_board(rows, cols, fill, rng):
+    """ Fill the bottom rows of the board with random blocks, leaving at least one gap in every row. """
+    board = Board(rows, cols)
+    filled_rows = max(1, round(rows * FILLS[fill]))
+    for y in range(rows - filled_rows, rows):
+        gap = rng.randrange(cols)
+        board.lock([(x, y) for x in range(cols) if x != gap and rng.random() < 0.8], rng.choice(COLOURS))
+    return board
+
+
+def build_full_board(board, rng):
+    """ Copy the board with its bottom rows (up to four) completed, so a clear has rows to remove. """
+    full_board = board.copy()
+    filled_rows = [y for y in range(board.rows) if board.row_bits[y]]
+    for y in filled_rows[-4:]:
+        full_board.lock([(x, y) for x in range(board.cols)], rng.choice(COLOURS))
+    return full_board
+
+
+def build_pieces(rows, cols, rng, count=200):
+    """ Create pieces scattered over the board so both valid and invalid positions are checked. """
+    names = piece_names()
+    pieces = []
+    for _ in range(count):
+        piece = TetrominoFactory.create_tetromino(rng.choice(names), rng.randrange(-1, cols + 2),
+                                                  rng.randrange(0, rows + 3))
+        piece.spin = rng.randrange(4)
+        pieces.append(piece)
+    return pieces
+
+
+def build_overhang_board(rows=20, cols=10):
+    """
+    Build a board whose bottom row is only open under a roof, so an I piece has to slide in under it to clear
+    the row. The roof covers the left of the board and the row below it is open on the right to get in.
+    """
+    board = Board(rows, cols)
+    board.lock([(x, rows - 1) for x in range(4, cols)], COLOURS[0])
+    board.lock([(x, rows - 3) for x in range(6)], COLOURS[1])
+    return board
+
+
+def build_case(rows, cols, fill):
+    rng = random.Random(f"{SEED}-{rows}x{cols}-{fill}")  # Every case has its own seed, so cases never shift
+    board = build_board(rows, cols, fill, rng)
+    spawn_pieces = [TetrominoFactory.create_tetromino(name, cols // 2, 0) for name in piece_names()]
+    return BoardCase(rows, cols, fill, board, board.to_grid(), build_full_board(board, rng),
+                     build_pieces(rows, cols, rng), spawn_pieces)
+
+
+@pytest.fixture(scope='module', params=[(rows, cols, fill) for rows, cols in BOARD_SIZES for fill in FILLS],
+                ids=lambda param: f"{param[0]}x{param[1]}-{param[2]}")
+def case(request):
+    """ One seeded board with the pieces the benchmarks are run on. """
+    return build_case(*request.param)
+
+
+@pytest.fixture(scope='module')
+def overhang_board():
+    """ A board where the best place for an I piece can only be reached by sliding it under an overhang. """
+    return build_overhang_board()
@@ -3,8 +3,12 @@
 # Takes input from the player and passes it to the model file
 
 from model import *
+import os
 import time  # At the top of your file
 import logic.config as config
+from logic.history import Mode, get_score_history
+from logic.profiler import FRAME, FrameProfiler
+from logic.replay import ReplayRecorder, apply_action, create_engine, load_replay, save_replay
 
 class Tetris(Observable):
     speeds = {
@@ -20,38 +24,85 @@ class Tetris(Observable):
         9: 0.02,
         10: 0.01,
     }
+    ai_weights = [1000, 500, 100, 300]  # Completed Lines | Board Height | Holes | Bumpiness
 
     def __init__(self, window_size, fast_game):
         super().__init__()
         self.window_size = window_size
         self.muted = False
-        self.level = 5 if fast_game else 0  # Set initial level based on game mode
+        self.fast_game = fast_game  # The engine sets the initial level based on game mode
+        self.planner = None
+        self.renderer = GameRenderer(window_size)
+        self.show_profiler = config.PROFILER_HUD
+        self.profiler_hud_time = 0  # pygame.time.get_ticks() at which the profiler overlay is next redrawn
+        self.ai_weights = load_weights(config.AI_WEIGHTS_FILE, Tetris.ai_weights)  # Tuned weights if they were saved
         self.initialise()
 
     def initialise(self):
         """Initializes game variables."""
-        (self.locked_positions, self.paused, self.change_piece, self.run, self.current_piece,
-         self.next_piece, self.clock, self.fall_time, self.fall_speed, self.level_time, self.score,
-         _) = initialize_game_state()
+        (self.engine, self.paused, self.run, self.clock, self.fall_time, self.fall_speed,
+         self.level_time) = initialize_game_state(self.fast_game)
         self.ai_move = None
+        self.best_move = None
+        self.best_move_planned = False
+        self.planned_piece = None
+        self.ai_path = None  # Actions of best_move's path still to take
+        self.ai_path_target = None  # Placement the path belongs to
+        self.time_to_simulate = 0  # Milliseconds of real time not simulated yet
+        self.play_time = 0  # Milliseconds of game time played, pauses are not counted
+        self.max_time_to_simulate = 250  # Never catch up more than this after a slow frame
+        self.rendered_state = None
+        self.piece_rows = set()  # Rows the falling piece was drawn on in the last frame
+        self.changed_rows = set()  # Rows of locked blocks that moved since the last frame
+        # Every action that changes the game is recorded so the game can be replayed from its seed
+        self.recorder = ReplayRecorder(self.engine, config.SIMULATION_STEP) if config.RECORD_REPLAYS else None
+        self.engine.recorder = self.recorder
+        # Times every phase of every frame for the profiler overlay and the trace file
+        self.profiler = FrameProfiler(config.PROFILER_WINDOW, trace=config.PROFILER_TRACE_FILE is not None)
+        self.engine.profiler = self.profiler
         self.fall_speed = self.speeds.get(self.level, self.speeds[0])
+        if self.planner is not None:
+            self.planner.stop()
+            self.planner = None
+        self.renderer.invalidate()
+
+    # The game state is held by the headless engine, these properties expose it to the rest of the game
+    @property
+    def board(self):
+        return self.engine.board
+
+    @property
+    def current_piece(self):
+        return self.engine.current_piece
+
+    @property
+    def next_piece(self):
+        return self.engine.next_piece
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def level(self):
+        return self.engine.level
 
     def launch_game(self):
         """Main game loop that handles game progression."""
-        pygame.mixer.music.load('sound/music.mp3')
-        pygame.mixer.music.set_volume(0.1)  # Set between 0.0 and 1.0
-        pygame.mixer.music.play(-1)  # The -1 means the music will loop indefinitely
+        assets.play_music(config.MUSIC_FILE, config.MUSIC_VOLUME)
 
         # Create an observer instance
-        score_observer = ScoreObserver(self.window_size)
+        score_observer = ScoreObserver(self.window_size, self.renderer)
         # Add observer to the list of observers
         self.add_observer(score_observer)
 
-        level_observer = LevelObserver(self.window_size)
+        level_observer = LevelObserver(self.window_size, self.renderer)
         self.add_observer(level_observer)
 
         while self.run:
             self.game_cycle()
+        self.save_replay()
+        self.save_profile()
 
     def handle_events(self):
         """Handles user input events."""
@@ -66,20 +117,24 @@ class Tetris(Observable):
         """Processes keydown events for game actions."""
         if not config.AI_ENABLED:  # Only allow these controls if AI is not enabled
             if event.key == pygame.K_LEFT:
-                shift_piece(self.current_piece, self.grid, "LEFT")
+                self.engine.apply_action("LEFT")
             elif event.key == pygame.K_RIGHT:
-                shift_piece(self.current_piece, self.grid, "RIGHT")
+                self.engine.apply_action("RIGHT")
             elif event.key == pygame.K_UP:
-                shift_piece(self.current_piece, self.grid, "ROTATE")
+                self.engine.apply_action("ROTATE")
+            elif event.key == pygame.K_SPACE:
+                self.hard_drop_current_piece()
         if event.key == pygame.K_ESCAPE:
             self.paused = not self.paused
             while self.paused:
                 render_quit_dialog(self.window_size)
                 pygame.display.flip()
                 pygame.time.wait(100)
-                self.run, self.paused = process_quit_events(self.paused, self.run, self.score, self.window_size)
+                self.run, self.paused = process_quit_events(self.paused, self.run)
                 if not self.run:
+                    self.save_game()  # A game that was quit keeps its score like one that ended
                     break  #
+            self.resume_after_dialog()  # The dialog was drawn over the game
         elif event.key == pygame.K_p:
             self.paused = not self.paused
             while self.paused:
@@ -87,33 +142,45 @@ class Tetris(Observable):
                 pygame.display.flip()
                 pygame.time.wait(100)
                 self.paused = process_pause_events(self.paused)
+            self.resume_after_dialog()  # The dialog was drawn over the game
         elif event.key == pygame.K_m:
             self.muted = not self.muted
-            volume = 0 if self.muted else 0.1
-            pygame.mixer.music.set_volume(volume)  # Mute/unmute the music accordingly
+            volume = 0 if self.muted else config.MUSIC_VOLUME
+            if pygame.mixer.get_init():
+                pygame.mixer.music.set_volume(volume)  # Mute/unmute the music accordingly
+        elif event.key == pygame.K_F3:
+            self.show_profiler = not self.show_profiler
+            self.profiler_hud_time = 0
+            if not self.show_profiler:
+                self.renderer.set_overlay(None)
+
+    def notify_observers(self):
+        with self.profiler.phase('observers'):
+            super().notify_observers()
 
     # Call this method whenever the score changes
     def set_score(self, score):
-        self.score = score
+        self.engine.score = score
         self.notify_observers()
 
     def set_level(self, level):
-        self.level = level
+        self.engine.level = level
         self.fall_speed = self.speeds.get(self.level, self.speeds[0])
         self.notify_observers()
 
     def handle_AI(self):
         """Manages AI decision-making and actions."""
-        if self.fall_time / 1000 <= self.fall_speed:
+        if self.fall_time < self.fall_speed * 1000:
             return
 
-        self.fall_time = 0
-        if not hasattr(self, 'best_move') or not self.best_move:
-            self.best_move = self.compute_best_move()
+        self.fall_time -= self.fall_speed * 1000
+        if not self.best_move or not self.best_move_planned:
+            with self.profiler.phase('ai'):
+                self.best_move = self.compute_best_move() or self.best_move
 
         # Move the piece according to AI's decision
         if self.best_move:
-            self.move_piece_to_target(*self.best_move)
+            self.move_piece_to_target(self.best_move)
 
         pygame.event.pump()
 
@@ -123,128 +190,242 @@ class Tetris(Observable):
     def compute_best_move(self):
         """Computes the best move using the AI logic."""
         try:
-            start_time = time.time()
-            move = best_move(self.current_piece, self.grid, [1000, 500, 100, 300]) # Completed Lines | Board Height | Holes | Bumpiness
-            elapsed_time = time.time() - start_time
-            print(f"AI took {elapsed_time} seconds to compute.")
-
-            if elapsed_time > 0.5:
-                print("AI exceeded time limit!")
-                # Handle excessive time if needed
+            weights = self.ai_weights
+            if config.AI_BACKGROUND_PLANNING:
+                # Take the worker's plan when it is ready, otherwise use a quick one piece search for now
+                # and check for the worker's plan again on the next fall
+                self.request_ai_plan()
+                move = self.planner.get_plan(self.board, self.current_piece)
+                if move is not None:
+                    # Plans are made for the piece where it spawned, so its path is searched again from where it is
+                    move = replan_placement(self.current_piece, self.board, move)
+                self.best_move_planned = move is not None
+                if move is None and not self.best_move:
+                    move = lookahead_move(self.current_piece, None, self.board, weights)
+                elif move is None:
+                    return None
+            elif config.AI_SEARCH_DEPTH > 1:
+                # The search stops on its own once the time budget is spent
+                move = lookahead_move(self.current_piece, self.next_piece, self.board, weights,
+                                      config.AI_BEAM_WIDTH, config.AI_TIME_BUDGET)
+                self.best_move_planned = True
+            else:
+                move = best_move(self.current_piece, self.board, weights)
+                self.best_move_planned = True
             return move
         except Exception as e:
             print("Exception occurred during AI computation:", e)
 
-    def move_piece_to_target(self, target_rotation, target_x_position):
-        """Moves the current piece to the target x position."""
-        rotation_attempts = 0
-        while self.current_piece.spin != target_rotation and rotation_attempts < 4:
-            shift_piece(self.current_piece, self.grid, "ROTATE")
-            rotation_attempts += 1
-
-        if self.current_piece.x_pos < target_x_position:
-            shift_piece(self.current_piece, self.grid, "RIGHT")
-        elif self.current_piece.x_pos > target_x_position:
-            shift_piece(self.current_piece, self.grid, "LEFT")
+    def request_ai_plan(self):
+        """Asks the background planner to plan the current piece, once per piece."""
+        if self.planner is None:
+            self.planner = AIPlanner(self.ai_weights, config.AI_BEAM_WIDTH, config.AI_TIME_BUDGET)
+        if self.planned_piece is not self.current_piece:
+            self.planned_piece = self.current_piece  # Remember which piece has been sent to the planner
+            following_piece = self.engine.preview(2)[1]  # Lets the planner plan the next piece two deep as well
+            self.planner.request_plan(self.board, self.current_piece, self.next_piece, following_piece)
+
+    def move_piece_to_target(self, placement):
+        """Moves the current piece along the path of the placement, every input up to its next row per fall."""
+        if placement is not self.ai_path_target:
+            self.ai_path_target = placement
+            self.ai_path = list(placement.path)
+
+        while self.ai_path:
+            action = self.ai_path.pop(0)
+            if action == "DOWN":
+                break  # Gravity moves the piece down at the end of this fall
+            self.engine.apply_action(action)
 
     def drop_current_piece(self):
         """Drops the current piece by one unit and handles landing."""
-        self.current_piece.y_pos += 1
-        if not is_position_valid(self.current_piece, self.grid) and self.current_piece.y_pos > 0:
-            self.current_piece.y_pos -= 1
-            self.change_piece = True
-            if not self.muted:
-                config.block_land_sound.play()
-            self.best_move = None
+        piece = self.current_piece
+        rows_cleared = self.engine.step()
+        if rows_cleared is not None:
+            self.handle_piece_locked(piece, rows_cleared)
+
+    def hard_drop_current_piece(self):
+        """Drops the current piece straight to where it lands and locks it."""
+        if self.engine.game_over:
+            return
+        piece = self.current_piece
+        self.handle_piece_locked(piece, self.engine.hard_drop())
+        self.fall_time = 0  # The next piece gets a full fall before gravity moves it
+
+    def handle_piece_locked(self, piece, rows_cleared):
+        """Plays the sounds and updates the score after the engine locked a piece and spawned the next one."""
+        # The piece may lock before it is drawn where it landed, so its rows are redrawn
+        self.changed_rows.update(y for _, y in get_tetromino_positions(piece) if y > -1)
+        if rows_cleared:
+            self.changed_rows.update(range(self.board.cleared_rows[-1] + 1))  # Every row above the lowest clear moved
+        if not self.muted:
+            assets.play_sound('block_land')
+            if rows_cleared:
+                assets.play_sound('tiles_cleared')
+        self.best_move = None
+        if config.AI_ENABLED and config.AI_BACKGROUND_PLANNING:
+            self.request_ai_plan()  # Start planning the new piece straight away
+        self.set_score(self.engine.score)
+        self.set_level(self.engine.level)
 
 
     def game_cycle(self):
         try:
             """Represents a single game cycle, updating game state, rendering, and handling events."""
-            self.grid = generate_game_grid(self.locked_positions)
-            self.fall_time += self.clock.get_rawtime()
-            self.level_time += self.clock.get_rawtime()
-            self.clock.tick()
-
-            if config.AI_ENABLED:
-                self.handle_AI()
-
-            else:
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_DOWN]:
-                    shift_piece(self.current_piece, self.grid, "DOWN")
-
-                if self.fall_time / 1000 > self.fall_speed:
-                    self.fall_time = 0
-                    self.current_piece.y_pos += 1
-
-            self.handle_events()
-
-            # The shared logic
-            if not is_position_valid(self.current_piece, self.grid) and self.current_piece.y_pos > 0:
-                self.current_piece.y_pos -= 1
-                self.change_piece = True
-                if not self.muted:
-                    config.block_land_sound.play()
-
-            shape_pos = get_tetromino_positions(self.current_piece)
-            for pos in shape_pos:
-                x, y = pos
-                if y > -1:
-                    self.grid[y][x] = self.current_piece.colour
-
-            if self.change_piece:
-                for pos in shape_pos:
-                    self.locked_positions[pos] = self.current_piece.colour
-                self.current_piece = self.next_piece
-                self.next_piece = fetch_random_tetromino()
-                self.change_piece = False
-                self.set_score(self.score + remove_full_rows(self.grid, self.locked_positions, self.muted))
-                if config.FAST_GAME:
-                    self.set_level(determine_level_hard(self.score))
-                else:
-                    self.set_level(determine_level_easy(self.score))
-
-            render_game_window(self.window_size, self.grid, self.score, self.level)
-            display_upcoming_piece(self.next_piece, self.window_size)
-            self.notify_observers()  # Notify observers after rendering all other game elements
-            pygame.display.update()  # Ensure this is the last line in this method
-
-            if is_game_over(self.locked_positions):
+            profiler = self.profiler
+            # Wait for the next frame so the loop runs at most config.RENDER_FPS times per second
+            with profiler.phase('wait'):
+                frame_time = self.clock.tick(config.RENDER_FPS)
+            self.time_to_simulate = min(self.time_to_simulate + frame_time, self.max_time_to_simulate)
+
+            # The game is simulated in fixed steps, so gravity does not depend on the frame rate
+            with profiler.phase('simulation'):
+                while self.time_to_simulate >= config.SIMULATION_STEP and self.run and not self.engine.game_over:
+                    self.time_to_simulate -= config.SIMULATION_STEP
+                    self.simulation_step(config.SIMULATION_STEP)
+
+            with profiler.phase('events'):
+                self.handle_events()
+            with profiler.phase('hud'):
+                self.update_profiler_hud()
+            self.render_frame()
+            profiler.end_frame()
+
+            if is_game_over(self.board):
                 self.game_over_procedure()
 
         except Exception as e:
             print(f"Exception occurred in game_cycle: {e}")
             raise  # This will re-raise the exception after printing, giving you the full traceback.
 
-    def game_over_procedure(self):
-        """Procedure to run when the game is over."""
-        if not self.muted:
-            config.game_over_sound.play()
-        render_centered_text(self.window_size, "Game Over", 80, (255, 255, 255))
-        pygame.display.update()
-        pygame.time.delay(1500)
+    def render_frame(self, compare_all_rows=False):
+        """Draws the game if something on screen has changed since the last frame."""
+        piece = self.current_piece
+        state = (self.engine.pieces_placed, piece.x_pos, piece.y_pos, piece.spin)
+        if state == self.rendered_state and not self.renderer.has_pending_changes():
+            return
+        self.rendered_state = state
+
+        profiler = self.profiler
+        with profiler.phase('grid'):
+            # Draw the falling piece on top of the locked blocks
+            self.grid = generate_game_grid(self.board)
+            piece_rows = set()
+
+            # The ghost piece shows where the falling piece will land
+            if config.GHOST_PIECE:
+                ghost_colour = tuple(channel // 4 for channel in piece.colour)
+                for x, y in self.engine.ghost_positions():
+                    if y > -1:
+                        self.grid[y][x] = ghost_colour
+                        piece_rows.add(y)
+
+            for x, y in get_tetromino_positions(piece):
+                if y > -1:
+                    self.grid[y][x] = piece.colour
+                    piece_rows.add(y)
+
+        # Only the rows the piece or its ghost left or entered and the rows moved by a clear can have changed
+        rows = None if compare_all_rows else self.piece_rows | piece_rows | self.changed_rows
+        self.piece_rows = piece_rows
+        self.changed_rows = set()
+
+        # Only the parts of the window that changed are drawn and sent to the display
+        with profiler.phase('render'):
+            self.renderer.render(self.grid, self.next_piece, rows)
+        self.notify_observers()  # Notify observers after rendering all other game elements
+        with profiler.phase('display'):
+            pygame.display.update(self.renderer.flush())  # Ensure this is the last line in this method
+
+    def update_profiler_hud(self):
+        """Redraws the profiler overlay twice a second while it is shown."""
+        now = pygame.time.get_ticks()
+        if not self.show_profiler or now < self.profiler_hud_time:
+            return
+        self.profiler_hud_time = now + 500
+        frame_times = sorted(self.profiler.history[FRAME])
+        notes = [f"{1000 / frame_times[len(frame_times) // 2]:.0f} frames per second (median)"] if frame_times else []
+        if config.AI_ENABLED:
+            notes.append(f"AI transposition table hit rate {transposition_table.hit_rate():.0%}")
+        stats = font_cache_stats()
+        notes.append(f"Text cache {stats['texts']} texts, {stats['text_hit_rate']:.0%} hit rate, "
+                     f"font cache {stats['fonts']} fonts, {stats['font_hit_rate']:.0%} hit rate")
+        self.renderer.set_overlay(render_profiler_hud(self.profiler, notes))
+
+    def save_profile(self):
+        """Saves the time of every phase of every frame to config.PROFILER_TRACE_FILE when it is set."""
+        if config.PROFILER_TRACE_FILE is None:
+            return
+        self.profiler.save_trace(config.PROFILER_TRACE_FILE)
+        print(f"Frame profile saved to {config.PROFILER_TRACE_FILE}")
+
+    def save_replay(self):
+        """Saves the recorded game to config.REPLAY_DIR and returns the file name."""
+        if self.recorder is None or not self.engine.pieces_placed:
+            return None
+        os.makedirs(config.REPLAY_DIR, exist_ok=True)
+        filename = os.path.join(config.REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.engine.seed}.replay")
+        save_replay(filename, self.recorder.replay())
+        print(f"Replay saved to {filename}")
+        return filename
+
+    def simulation_step(self, step_time):
+        """Advances the game by one fixed step of step_time milliseconds."""
+        self.play_time += step_time
+        if self.recorder is not None:
+            self.recorder.tick += 1
+        self.fall_time += step_time
+        self.level_time += step_time
+
+        if config.AI_ENABLED:
+            self.handle_AI()
 
+        else:
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_DOWN]:
+                self.engine.apply_action("DOWN")
+
+            # The fall time is carried over rather than reset so the falls keep an exact rhythm
+            if self.fall_time >= self.fall_speed * 1000:
+                self.fall_time -= self.fall_speed * 1000
+                self.drop_current_piece()
+
+    def resume_after_dialog(self):
+        """Redraws the whole window and skips the time spent in a dialog."""
+        self.renderer.invalidate()
+        self.clock.tick()
+        self.time_to_simulate = 0
+        self.profiler.restart_frame()  # The time the dialog was open is not part of any phase
+
+    def save_game(self):
+        """Offers the score a place in the top 10 and records the game in the score history."""
         score_filename = 'scores.txt'
-
-        # Try to load existing scores.
-        try:
-            with open(score_filename, 'r') as file:
-                scores = [int(line.strip().split(' ', 1)[0]) for line in file.readlines()]
-        except FileNotFoundError:
-            scores = []
+        username = 'AI' if config.AI_ENABLED else 'Player'
 
         # Check if the player's score is a top 10 score.
-        if not scores or len(scores) < 10 or self.score > min(scores):
+        if get_score_store(score_filename).qualifies(self.score):
             if config.AI_ENABLED:
                 username = input_box(self.window_size, ai_mode=True)
                 update_score_file(score_filename, self.score, username)
             else:
                 username = input_box(self.window_size)
                 update_score_file(score_filename, self.score, username)
-        else:
-            # If the player's score is not a top 10 score,
-            pass
+
+        # Every finished game goes into the score history, whether or not it made the top 10
+        engine = self.engine
+        mode = Mode(engine.rows, engine.cols, engine.extended, engine.fast, config.AI_ENABLED)
+        get_score_history(config.SCORE_HISTORY_FILE).record_game(username, mode, engine.score, engine.lines_cleared,
+                                                                 engine.pieces_placed, self.play_time / 1000)
+
+    def game_over_procedure(self):
+        """Procedure to run when the game is over."""
+        if not self.muted:
+            assets.play_sound('game_over')
+        render_centered_text(self.window_size, "Game Over", 80, (255, 255, 255))
+        pygame.display.update()
+        pygame.time.delay(1500)
+
+        self.save_game()
 
         self.run = False
         #pygame.display.quit()
@@ -257,20 +438,71 @@ def play():
     game = Tetris(game_window, config.FAST_GAME)  # Pass the FAST_GAME variable to Tetris class
 
     # The contents of the launch_game() method are now here
-    pygame.mixer.music.load('sound/music.mp3')
-    pygame.mixer.music.set_volume(0.1)  # Set between 0.0 and 1.0
-    pygame.mixer.music.play(-1)  # The -1 means the music will loop indefinitely
+    assets.play_music(config.MUSIC_FILE, config.MUSIC_VOLUME)
 
     # Create an observer instance
-    score_observer = ScoreObserver(game.window_size)
+    score_observer = ScoreObserver(game.window_size, game.renderer)
     # Add observer to the list of observers
     game.add_observer(score_observer)
 
-    level_observer = LevelObserver(game.window_size)
+    level_observer = LevelObserver(game.window_size, game.renderer)
     game.add_observer(level_observer)
 
     while game.run:
         game.game_cycle()
+    game.save_replay()
+    game.save_profile()
 
     # Reset the game state before starting a new game
     game.initialise()
+
+
+def use_replay_settings(replay):
+    """Sets the board size and game mode in config to the ones the replay was recorded with."""
+    config.ROWS, config.COLS = replay.rows, replay.cols
+    config.LARGE_BOARD = (replay.rows, replay.cols) == (20, 15)
+    config.SMALL_BOARD = (replay.rows, replay.cols) == (16, 8)
+    config.EXTENDED_GAME = replay.extended
+    config.FAST_GAME = replay.fast
+    config.PIECE_GENERATOR = replay.generator
+
+
+def watch_replay(filename, speed=1.0):
+    """Shows a recorded game at the speed it was played, speed 2 shows it twice as fast."""
+    replay = load_replay(filename)
+    # The window draws the grid and mode labels from config, so it is set up like the recorded game
+    use_replay_settings(replay)
+    pygame.display.set_caption('Tetris replay')
+    game_window = pygame.display.set_mode((config.window_w, config.window_h))
+    game = Tetris(game_window, replay.fast)
+    game.engine = create_engine(replay)  # The replayed game is not recorded again
+    game.recorder = None
+    game.add_observer(ScoreObserver(game.window_size, game.renderer))
+    game.add_observer(LevelObserver(game.window_size, game.renderer))
+
+    tick = 0.0
+    actions = iter(replay.actions)
+    action = next(actions, None)
+    while game.run and action is not None:
+        tick += game.clock.tick(config.RENDER_FPS) * speed / replay.step
+        while action is not None and action[0] <= tick:
+            apply_action(game.engine, action[1])
+            action = next(actions, None)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                game.run = False
+        # Locks are not reported to the game while replaying, so every row is compared
+        game.render_frame(compare_all_rows=True)
+    return game.engine
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Watch a recorded game.")
+    parser.add_argument('replay', help="replay file saved in the replays folder")
+    parser.add_argument('--speed', type=float, default=1.0, help="playback speed, 2 is twice as fast")
+    arguments = parser.parse_args()
+    pygame.display.init()
+    pygame.font.init()
+    watch_replay(arguments.replay, arguments.speed)
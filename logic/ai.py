@@ -0,0 +1,238 @@
+# File contains the AI that picks where to place the current tetromino
+# reachable_placements searches the moves a player can make, so pieces can be steered under overhangs
+# best_move scores every place found that way together and returns it with the inputs that reach it
+# lookahead_move also places the next piece and keeps the best pair of placements within a time budget
+# Nothing in this file imports pygame so the AI can run in headless games
+
+import json
+import time
+from collections import deque, namedtuple
+from logic.board import Board
+from logic.engine import get_tetromino_positions, is_position_valid, landing_row
+from logic.evaluator import evaluate_board, evaluate_placements, pack_board, transposition_table
+
+
+def legal_placements(piece, grid):
+    """
+    Return a (move, positions) pair for every distinct place the piece can be dropped to, each place once.
+    Moves are (rotation, x) pairs as used by TetrisEngine.place: the piece is turned rotation times from the spin
+    it has, then moved to column x and dropped from the top. Only the distinct rotations of the shape are tried,
+    so O has 1 and I, S and Z have 2, and only the columns that keep the piece between the walls of the board.
+    """
+    columns = grid.cols if isinstance(grid, Board) else len(grid[0])
+    test_piece = piece.copy()
+    placements = []
+    seen = set()
+    for turns in range(len(piece.rotations)):
+        # The piece is turned one step at a time where it is, a turn that does not fit stops every later one
+        spin = piece.spin + turns
+        test_piece.set_state(spin, piece.x_pos, piece.y_pos)
+        if turns and not is_position_valid(test_piece, grid):
+            break
+
+        rotation = test_piece.rotation()
+        for x_position in range(-rotation.left, columns - rotation.right):
+            test_piece.set_state(spin, x_position, 0)
+            test_piece.y_pos = landing_row(test_piece, grid)
+            if not is_position_valid(test_piece, grid):
+                continue
+            positions = get_tetromino_positions(test_piece)
+            key = frozenset(positions)  # Shapes registered with two equal rotations would land in the same place
+            if key not in seen:
+                seen.add(key)
+                placements.append(((turns, x_position), positions))
+    return placements
+
+
+def possible_moves(piece, grid):
+    """ Return the (rotation, x) move of every distinct place the piece can be dropped to. """
+    return [move for move, _ in legal_placements(piece, grid)]
+
+
+def mask_fits(row_bits, rows, masks, y):
+    """ Check the (dy, bitmask) rows of a piece against the board rows, cells above the board are always free. """
+    for dy, mask in masks:
+        row = y + dy
+        if row >= rows:
+            return False
+        if row > -1 and row_bits[row] & mask:
+            return False
+    return True
+
+
+# A place a piece can lock in, with the shortest list of shift_piece actions that moves it there from where it was
+Placement = namedtuple('Placement', ['spin', 'x_pos', 'y_pos', 'positions', 'path'])
+SEARCH_ACTIONS = ("LEFT", "RIGHT", "DOWN", "ROTATE")
+
+
+def reachable_placements(piece, board):
+    """
+    Search every (spin, x, y) state the piece can reach from where it is with the moves of shift_piece,
+    breadth first, and return a Placement for every state it would lock in (one it cannot move down from).
+    Placements are ordered by the length of their path, spins are counted from 0 to the number of rotations.
+    """
+    rotations = piece.rotations
+    spins = len(rotations)
+    row_bits, rows, cols = board.row_bits, board.rows, board.cols
+
+    # States are numbered (spin, x, y) -> index, x between the widest walls and y from the piece down
+    x_low = min(-rotation.left for rotation in rotations)
+    x_high = max(cols - 1 - rotation.right for rotation in rotations)
+    y_low = piece.y_pos
+    y_high = rows - 1 - min(rotation.bottom for rotation in rotations)
+    if y_high < y_low:
+        return []
+    width, height = x_high - x_low + 1, y_high - y_low + 1
+
+    # Which states the piece fits in, found for every state up front so the search itself only looks them up
+    size = spins * width * height
+    free = bytearray(size)
+    for spin, rotation in enumerate(rotations):
+        for x in range(max(x_low, -rotation.left), min(x_high, cols - 1 - rotation.right) + 1):
+            masks = [(dy, mask << (x + rotation.left)) for dy, mask in rotation.row_masks]
+            base = (spin * width + x - x_low) * height - y_low
+            for y in range(y_low, y_high + 1):
+                if mask_fits(row_bits, rows, masks, y):
+                    free[base + y] = 1
+
+    def index(spin, x, y):
+        return (spin * width + x - x_low) * height + y - y_low
+
+    start_spin = piece.spin % spins
+    if not x_low <= piece.x_pos <= x_high or not free[index(start_spin, piece.x_pos, piece.y_pos)]:
+        return []
+
+    # States are searched by index: x - 1 and x + 1 are height apart, y + 1 is the next index
+    # and the next spin is width * height further on, wrapping back to spin 0
+    spin_size = width * height
+    start_index = index(start_spin, piece.x_pos, piece.y_pos)
+    visited = bytearray(size)  # Bitmap of the states reached so far
+    parents = [-1] * size  # State each state was first reached from, and the action that reached it
+    actions = bytearray(size)
+    visited[start_index] = 1
+    queue = deque([start_index])
+    placements = []
+    while queue:
+        current = queue.popleft()
+        x_offset, y_offset = divmod(current % spin_size, height)
+        following_states = (current - height if x_offset > 0 else -1,
+                            current + height if x_offset < width - 1 else -1,
+                            current + 1 if y_offset < height - 1 else -1,
+                            (current + spin_size) % size)
+        for action, following in enumerate(following_states):
+            if following >= 0 and free[following] and not visited[following]:
+                visited[following] = 1
+                parents[following] = current
+                actions[following] = action
+                queue.append(following)
+
+        if following_states[2] < 0 or not free[following_states[2]]:
+            # The piece locks here, so follow the parents back to the start for its path
+            path = []
+            state = current
+            while state != start_index:
+                path.append(SEARCH_ACTIONS[actions[state]])
+                state = parents[state]
+            spin = current // spin_size
+            x, y = x_offset + x_low, y_offset + y_low
+            positions = [(x + dx, y + dy) for dx, dy in rotations[spin].cells]
+            placements.append(Placement(spin, x, y, positions, path[::-1]))
+    return placements
+
+
+def best_move(current_piece, grid, weights, table=transposition_table):
+    """
+    Return the Placement of the best place the piece can reach from where it is, or None when there is none.
+    Every place the search finds, under overhangs as well, is scored in one batch.
+    """
+    board = grid if isinstance(grid, Board) else Board.from_grid(grid)
+    placements = reachable_placements(current_piece, board)
+    if not placements:
+        return None
+
+    scores = evaluate_placements(grid, [placement.positions for placement in placements], weights, table)
+    # Placements are ordered by the length of their path, so of equal scores the shortest path wins
+    return placements[max(range(len(placements)), key=scores.__getitem__)]
+
+
+def lookahead_move(current_piece, next_piece, board, weights, beam_width=4, time_budget=None,
+                   table=transposition_table):
+    """
+    Pick the Placement of the current piece by also placing the next piece.
+
+    Every place the current piece can reach is scored, then the best beam_width of them are expanded with
+    every placement of the next piece. Each pair is scored by the rows the first piece clears plus the
+    best board the second piece can reach. The search stops expanding once time_budget seconds have
+    passed and returns the best placement found so far. Without a next piece only the current piece is placed.
+    The best score of each board and next piece pair is kept in the transposition table.
+    """
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    first_placements = reachable_placements(current_piece, board)
+    if not first_placements:
+        return None
+
+    # One ply: the best single placement is the answer if the time runs out
+    first_scores = evaluate_placements(board, [placement.positions for placement in first_placements], weights,
+                                       table)
+    ranked = sorted(range(len(first_placements)), key=first_scores.__getitem__, reverse=True)
+    best_placement = first_placements[ranked[0]]
+    best_evaluation = None
+
+    completed_line_weight = weights[0]
+    for index in ranked[:beam_width] if next_piece is not None else []:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        placement = first_placements[index]
+        test_board = board.copy(colours=False)
+        test_board.lock(placement.positions, None)
+        rows_cleared = test_board.clear_full_rows()
+
+        key = (pack_board(test_board), next_piece.name) if table is not None and next_piece.name else None
+        second_best = table.get(key) if key is not None else None
+        if second_best is None:
+            # The next piece is only dropped straight down, which keeps the second ply quick
+            second_placements = legal_placements(next_piece, test_board)
+            if not second_placements:
+                continue  # The next piece would not fit, so this placement loses the game
+
+            second_positions = [positions for _, positions in second_placements]
+            second_best = max(evaluate_placements(test_board, second_positions, weights, table))
+            if key is not None:
+                table.put(key, second_best)
+
+        evaluation = completed_line_weight * rows_cleared + second_best
+        if best_evaluation is None or evaluation > best_evaluation:
+            best_placement, best_evaluation = placement, evaluation
+
+    return best_placement
+
+
+def replan_placement(piece, board, placement):
+    """
+    Return the Placement that locks the piece where the given one does, searched again from where the piece is now,
+    or None when it cannot get there any more. Used for placements planned before the piece moved.
+    """
+    spins = len(piece.rotations)
+    target = (placement.spin % spins, placement.x_pos, placement.y_pos)
+    for found in reachable_placements(piece, board):
+        if (found.spin, found.x_pos, found.y_pos) == target:
+            return found
+    return None
+
+
+def load_weights(filename, default):
+    """ Load the AI weights saved by the self-play runner, or return the default weights if there are none. """
+    try:
+        with open(filename, 'r') as f:
+            weights = json.load(f)['weights']
+    except (FileNotFoundError, KeyError, ValueError):
+        return list(default)
+    return [float(w) for w in weights] if len(weights) == len(default) else list(default)
+
+
+def save_weights(filename, weights, summary=None):
+    """ Save AI weights (and the self-play results they reached) for the game to load. """
+    with open(filename, 'w') as f:
+        json.dump({'weights': list(weights), 'results': summary}, f, indent=2)
@@ -0,0 +1,98 @@
+# File holds the images and sounds used by the game
+# Nothing is loaded at import, every asset is loaded the first time it is used and then kept for the whole session
+# Images are converted to the pixel format of the display so blitting them does not convert them on every frame
+# preload() can load everything on a background thread while the start screen is shown
+
+import threading
+import pygame
+import logic.config as config
+
+
+class AssetManager:
+    """ Loads the images and sounds listed in config.IMAGES and config.SOUNDS on first use and caches them. """
+
+    def __init__(self, images, sounds):
+        self.image_files = images  # name -> (file, size or None)
+        self.sound_files = sounds  # name -> (file, volume)
+        self.loaded_images = {}  # name -> surface as loaded, before conversion
+        self.images = {}  # name -> surface converted to the display format
+        self.sounds = {}  # name -> pygame Sound, or None when there is no audio device
+        self.lock = threading.RLock()  # Held while loading so the preload thread and the game never load twice
+        self.preload_thread = None
+
+    def load_image(self, name):
+        """ Load and scale an image without converting it, this is safe on any thread. """
+        with self.lock:
+            surface = self.loaded_images.get(name)
+            if surface is None:
+                filename, size = self.image_files[name]
+                surface = pygame.image.load(filename)
+                if size is not None:
+                    surface = pygame.transform.scale(surface, size)
+                self.loaded_images[name] = surface
+            return surface
+
+    def image(self, name):
+        """ Return the image converted to the display format, the display has to be open. """
+        surface = self.images.get(name)
+        if surface is None:
+            surface = self.load_image(name)
+            if pygame.display.get_surface() is not None:
+                # Conversion needs the display, so it is only done here on the game thread
+                surface = surface.convert()
+                self.images[name] = surface
+        return surface
+
+    def init_mixer(self):
+        """ Start the sound mixer, returning False when there is no audio device. """
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            return False
+        return True
+
+    def sound(self, name):
+        """ Return the sound, or None when sounds cannot be played. """
+        with self.lock:
+            if name not in self.sounds:
+                sound = None
+                if self.init_mixer():
+                    filename, volume = self.sound_files[name]
+                    sound = pygame.mixer.Sound(filename)
+                    sound.set_volume(volume)
+                self.sounds[name] = sound
+            return self.sounds[name]
+
+    def play_sound(self, name):
+        sound = self.sound(name)
+        if sound is not None:
+            sound.play()
+
+    def play_music(self, filename, volume):
+        """ Loop the music file forever if there is an audio device. """
+        with self.lock:
+            if not self.init_mixer():
+                return
+        pygame.mixer.music.load(filename)
+        pygame.mixer.music.set_volume(volume)  # Set between 0.0 and 1.0
+        pygame.mixer.music.play(-1)  # The -1 means the music will loop indefinitely
+
+    def preload(self, background=True):
+        """ Load every image and sound, on a daemon thread unless background is False. """
+        if not background:
+            self.load_all()
+        elif self.preload_thread is None:
+            self.preload_thread = threading.Thread(target=self.load_all, name="AssetPreload", daemon=True)
+            self.preload_thread.start()
+
+    def load_all(self):
+        for name in self.image_files:
+            self.load_image(name)
+        for name in self.sound_files:
+            self.sound(name)
+
+
+# Shared asset manager used by the game and the menus
+assets = AssetManager(config.IMAGES, config.SOUNDS)
@@ -0,0 +1,165 @@
+# File holds the board engine that stores locked tetromino blocks
+# Each row of the board is an integer bitmask, bit x is set when column x is filled
+# Block colours are kept in a separate list of rows that is only used for drawing
+# Only the rows that received blocks since the last clear are checked for full rows, and the rows
+# above the lowest full row are compacted in one pass from the bottom up
+# The highest block of every column is cached so a piece's landing row comes from its bottom profile
+# This file does not import pygame so the board can be used by the AI without a display
+
+EMPTY_CELL = (0, 0, 0)  # This represents an empty cell
+
+
+class Board:
+    """ Board stores the locked blocks of a game as one bitmask per row. """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.full_row = (1 << cols) - 1  # Bitmask of a row with every column filled
+        self.row_bits = [0] * rows
+        self.colours = [[EMPTY_CELL] * cols for _ in range(rows)]
+        self.overflow = False  # Set when a block is locked above the top of the board
+        self.locked_rows = set()  # Rows that received blocks since the last clear, only these can be full
+        self.cleared_rows = []  # Rows removed by the last clear, numbered as they were before the shift
+        self.column_tops = [rows] * cols  # Row of the highest block in each column, rows when the column is empty
+
+    def copy(self, colours=True):
+        """ Return a copy of the board, the colours are skipped when they are not needed (e.g. by the AI). """
+        board = Board.__new__(Board)
+        board.rows = self.rows
+        board.cols = self.cols
+        board.full_row = self.full_row
+        board.row_bits = self.row_bits.copy()
+        board.colours = [row.copy() for row in self.colours] if colours and self.colours is not None else None
+        board.overflow = self.overflow
+        board.locked_rows = self.locked_rows.copy()
+        board.cleared_rows = self.cleared_rows
+        board.column_tops = self.column_tops.copy()
+        return board
+
+    def is_filled(self, x, y):
+        """ Check if a cell holds a locked block, cells above the board are always empty. """
+        if y < 0:
+            return False
+        return (self.row_bits[y] >> x) & 1 == 1
+
+    def fits(self, positions):
+        """ Check that every (x, y) position is inside the board walls and not on a locked block. """
+        rows, cols, row_bits = self.rows, self.cols, self.row_bits
+        for x, y in positions:
+            if x < 0 or x >= cols or y >= rows:
+                return False
+            if y > -1 and (row_bits[y] >> x) & 1:
+                return False
+        return True
+
+    def lock(self, positions, colour):
+        """ Lock the given (x, y) positions into the board with the given colour. """
+        for x, y in positions:
+            if y < 0:
+                self.overflow = True
+                continue
+            self.row_bits[y] |= 1 << x
+            self.locked_rows.add(y)
+            if y < self.column_tops[x]:
+                self.column_tops[x] = y
+            if self.colours is not None:
+                self.colours[y][x] = colour
+
+    def full_rows(self):
+        """ Return the indices of every completely filled row. """
+        return [y for y, bits in enumerate(self.row_bits) if bits == self.full_row]
+
+    def clear_full_rows(self):
+        """
+        Remove every full row, shift the rows above it down and return the number of rows removed.
+        The removed rows are left in cleared_rows so the renderer knows which part of the board moved.
+        """
+        row_bits, full_row = self.row_bits, self.full_row
+        full = sorted(y for y in self.locked_rows if row_bits[y] == full_row)
+        self.locked_rows.clear()
+        self.cleared_rows = full
+        if not full:
+            return 0
+
+        # Rows below the lowest full row stay where they are, every row above it moves down past the full rows
+        colours = self.colours
+        full_set = set(full)
+        write = full[-1]
+        for read in range(full[-1], -1, -1):
+            if read in full_set:
+                continue
+            row_bits[write] = row_bits[read]
+            if colours is not None:
+                colours[write] = colours[read]
+            write -= 1
+
+        # The rows left at the top are empty
+        for y in range(write + 1):
+            row_bits[y] = 0
+            if colours is not None:
+                colours[y] = [EMPTY_CELL] * self.cols
+        self.update_column_tops()
+        return len(full)
+
+    def update_column_tops(self):
+        """ Find the highest block of every column again, scanning down only until every column has been seen. """
+        tops = self.column_tops = [self.rows] * self.cols
+        unseen = self.full_row
+        for y, bits in enumerate(self.row_bits):
+            new = bits & unseen
+            while new:
+                lowest = new & -new
+                tops[lowest.bit_length() - 1] = y
+                new ^= lowest
+            unseen &= ~bits
+            if not unseen:
+                break
+
+    def drop_distance(self, rotation, x, y):
+        """
+        Return how many rows a piece with the given Rotation at (x, y) can fall, the piece has to fit where it is.
+        Each column of the piece's bottom profile is compared with the highest block of that board column.
+        """
+        tops = self.column_tops
+        distance = None
+        for column, bottom in enumerate(rotation.profile, x + rotation.left):
+            gap = tops[column] - 1 - (y + bottom)
+            if gap < 0:
+                # The piece is under an overhang in this column, so fall back to checking row by row
+                return self.scan_drop_distance(rotation, x, y)
+            if distance is None or gap < distance:
+                distance = gap
+        return distance
+
+    def scan_drop_distance(self, rotation, x, y):
+        """ Drop the piece one row at a time until it would collide, for pieces below the top of a column. """
+        distance = 0
+        while self.fits([(x + dx, y + distance + 1 + dy) for dx, dy in rotation.cells]):
+            distance += 1
+        return distance
+
+    def is_game_over(self):
+        """ The game is over once a block has been locked in the top row or above the board. """
+        return self.overflow or self.row_bits[0] != 0
+
+    def pack(self):
+        """ Return the whole board as one integer, row y takes bits y * cols up to (y + 1) * cols - 1. """
+        packed = 0
+        for bits in reversed(self.row_bits):
+            packed = (packed << self.cols) | bits
+        return packed
+
+    @staticmethod
+    def from_grid(grid):
+        """ Build a board from a list of rows of colours, the format returned by to_grid. """
+        board = Board(len(grid), len(grid[0]))
+        for y, row in enumerate(grid):
+            for x, colour in enumerate(row):
+                if colour != EMPTY_CELL:
+                    board.lock([(x, y)], colour)
+        return board
+
+    def to_grid(self):
+        """ Return the board as a list of rows of colours, the format used to draw the game. """
+        return [row.copy() for row in self.colours]
@@ -1,17 +1,28 @@
 
-
-
-# Pygame imported for font and mixer module initialisations
-import pygame
-
 window_w, window_h = 1000, 800   # Main window width 1000 height 800
 play_w, play_h = 300, 600  # Game board width 300 height 600
 tetromino_wh = 30  # Tetromino width 30 height 30# File stores any global variables as well images and sounds
 
+RENDER_FPS = 60  # Most frames drawn per second
+SIMULATION_STEP = 10  # Milliseconds of game time simulated per fixed step (the fall time at level 10)
+GHOST_PIECE = True  # Show where the falling piece will land
+RECORD_REPLAYS = True  # Save every game to REPLAY_DIR, watch one with: python controller.py <file>
+REPLAY_DIR = 'replays'
+SCORE_HISTORY_FILE = 'scores.db'  # SQLite history of every finished game, shown on the score screen
+PROFILER_HUD = False  # Show the frame profiler overlay when a game starts, F3 shows and hides it during a game
+PROFILER_WINDOW = 300  # Number of the latest frames the profiler percentiles are taken over
+PROFILER_TRACE_FILE = None  # e.g. 'profile.csv' or 'profile.json' to save the time of every phase of every frame
+
 AI_ENABLED = False
+AI_SEARCH_DEPTH = 2  # 1 places only the current piece, 2 also places the next piece
+AI_BEAM_WIDTH = 4  # Number of the best current piece placements the next piece is tried on
+AI_TIME_BUDGET = 0.01  # Seconds the AI may spend choosing one move (one fall at level 10)
+AI_WEIGHTS_FILE = 'ai_weights.json'  # Weights saved by the self-play runner (python -m logic.selfplay)
+AI_BACKGROUND_PLANNING = True  # Search on a worker thread so the game keeps drawing while the AI thinks
 FAST_GAME = False  # Set to False for slow mode
 
 EXTENDED_GAME = False
+PIECE_GENERATOR = 'uniform'  # 'uniform' picks every piece at random, 'bag' deals each piece type once per bag
 LARGE_BOARD = False  # Set to False for standard board size
 SMALL_BOARD = False  # Set to False for standard board size
 
@@ -28,30 +39,21 @@ if SMALL_BOARD:
 window_x = (window_w - play_w) // 5 # Game window top x
 window_y = (window_h - play_h) - 20 # Game window top y
 
-pygame.font.init()  # Pygame font module initialisation
-pygame.mixer.init()  # Pygame sound mixer module initialisation
-
-
-# Main game music
-#pygame.mixer.music.load('path_to_your_music_file.mp3')
-#pygame.mixer.music.set_volume(1.0)  # Set between 0.0 and 1.0
-#pygame.mixer.music.play(-1)  # The -1 means the music will loop indefinitely
-
-# Sound for blocks landing
-block_land_sound = pygame.mixer.Sound('sound/bop.wav')
-block_land_sound.set_volume(2)
-
-# Game over/ player lost sound
-game_over_sound = pygame.mixer.Sound('sound/game_over.wav')
-game_over_sound.set_volume(2)
-
-# Cleared tiles sound
-tiles_cleared_sound = pygame.mixer.Sound('sound/clear.wav')
-tiles_cleared_sound.set_volume(2)
-
-# Main game background image
-background_image = pygame.image.load('images/background_image.jpg')
-background_image = pygame.transform.scale(background_image, (window_w, window_h))
-background_image = pygame.transform.scale(background_image, (window_w, window_h))
+# Images and sounds, loaded on first use by logic/assets.py so importing this file has no side effects
+# Images: name -> (file, size it is scaled to or None)
+IMAGES = {
+    'background': ('images/background_image.jpg', (window_w, window_h)),  # Main game background image
+    'page_background': ('game_page_background.jpg', None),  # Background of the menu screens
+}
+
+# Sounds: name -> (file, volume)
+SOUNDS = {
+    'block_land': ('sound/bop.wav', 2),  # Sound for blocks landing
+    'game_over': ('sound/game_over.wav', 2),  # Game over/ player lost sound
+    'tiles_cleared': ('sound/clear.wav', 2),  # Cleared tiles sound
+}
+
+MUSIC_FILE = 'sound/music.mp3'  # Main game music
+MUSIC_VOLUME = 0.1
 
 EMPTY_CELL = (0, 0, 0)  # This represents an empty cell
\ No newline at end of file
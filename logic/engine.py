@@ -0,0 +1,297 @@
+# File contains the headless game engine
+# Defines the game rules: moving pieces, locking them, clearing rows, scoring and levels
+# Nothing in this file imports pygame so whole games can be simulated without a display or audio device
+# The controller wraps TetrisEngine for the interactive game
+
+import copy
+import random
+from contextlib import nullcontext
+from collections import namedtuple
+from logic.board import Board, EMPTY_CELL
+from logic.randomiser import create_generator, piece_names, shape_id
+from logic.tetromino import Tetromino
+
+# Points awarded for the number of rows cleared by a single piece
+ROW_CLEAR_SCORES = {0: 0, 1: 100, 2: 300, 3: 600, 4: 1000}
+
+# Snapshot of the game returned by TetrisEngine.observe
+Observation = namedtuple('Observation', ['board', 'current_piece', 'next_piece', 'score', 'level',
+                                         'lines_cleared', 'pieces_placed', 'game_over'])
+
+
+def determine_level_easy(score):
+    if 0 <= score < 300:
+        return 0
+    elif 300 <= score < 1000:
+        return 1
+    elif 1000 <= score < 2000:
+        return 2
+    elif 2000 <= score < 4000:
+        return 3
+    elif 4000 <= score < 6000:
+        return 4
+    elif 6000 <= score < 8000:
+        return 5
+    elif 8000 <= score < 10000:
+        return 6
+    elif 10000 <= score < 15000:
+        return 7
+    elif 15000 <= score < 20000:
+        return 8
+    elif 20000 <= score < 25000:
+        return 9
+    else:
+        return 10
+
+def determine_level_hard(score):
+    if 0 <= score < 500:
+        return 5
+    elif 500 <= score < 1500:
+        return 6
+    elif 1500 <= score < 3000:
+        return 7
+    elif 3000 <= score < 5000:
+        return 8
+    elif 5000 <= score < 10000:
+        return 9
+    else:
+        return 10
+
+
+def score_cleared_rows(rows_cleared):
+    """ Calculate score based on number of lines cleared. """
+    return ROW_CLEAR_SCORES[min(rows_cleared, 4)]
+
+
+def create_random_tetromino(rng, cols, extended=False):
+    """ Generate a random tetromino at the top-middle of a board with the given number of columns. """
+    tetromino_type = rng.choice(piece_names(extended))
+    spawn_x = cols // 2  # This will roughly center the tetromino on the game board
+    # shape_id knows the extended types too, the factory only creates them after add_extended_tetrominoes
+    return Tetromino(shape_id(tetromino_type), spawn_x, 0)
+
+
+def get_tetromino_positions(tetromino):
+    """ Converts the tetromino to a list of its block positions on the game grid. """
+    # Look up the compiled cell offsets of the current rotation of the tetromino
+    rotation = tetromino.rotation()
+    x_pos, y_pos = tetromino.x_pos, tetromino.y_pos
+    return [(x_pos + dx, y_pos + dy) for dx, dy in rotation.cells]
+
+
+def is_position_valid(tetromino, grid):
+    """ Check if the given tetromino position is valid, the grid can be a Board or a list of rows of colours. """
+    # Convert the tetromino format to its positions on the grid
+    tetromino_positions = get_tetromino_positions(tetromino)
+
+    # Boards index their rows directly, so only the cells of the piece are looked up
+    if isinstance(grid, Board):
+        return grid.fits(tetromino_positions)
+
+    max_x = len(grid[0]) - 1
+    max_y = len(grid) - 1
+
+    for x, y in tetromino_positions:
+        # Boundary Check
+        if x < 0 or x > max_x or y > max_y:
+            return False
+        # Collision Check
+        if y > -1 and grid[y][x] != EMPTY_CELL:
+            return False
+
+    return True
+
+
+def landing_row(tetromino, grid):
+    """
+    Return the y_pos the tetromino lands on when it falls straight down from where it is.
+    A Board answers from its column heights, a list grid is checked one row at a time.
+    """
+    y_pos = tetromino.y_pos
+    if isinstance(grid, Board):
+        if not grid.fits(get_tetromino_positions(tetromino)):
+            return y_pos - 1
+        return y_pos + grid.drop_distance(tetromino.rotation(), tetromino.x_pos, y_pos)
+
+    while is_position_valid(tetromino, grid):
+        tetromino.y_pos += 1
+    landing_y = tetromino.y_pos - 1
+    tetromino.y_pos = y_pos
+    return landing_y
+
+
+def shift_piece(current_piece, grid, direction):
+    """
+    Move the current tetromino piece in the specified direction.
+
+    Parameters:
+    - current_piece: The tetromino piece to move.
+    - grid: Current game grid.
+    - direction: The direction to move the piece ("LEFT", "RIGHT", "DOWN", "ROTATE").
+    """
+    # Move the piece to the left
+    if direction == "LEFT":
+        current_piece.x_pos -= 1
+        if not is_position_valid(current_piece, grid):  # Check if the move is valid
+            current_piece.x_pos += 1
+
+    # Move the piece to the right
+    elif direction == "RIGHT":
+        current_piece.x_pos += 1
+        if not is_position_valid(current_piece, grid):  # Check if the move is valid
+            current_piece.x_pos -= 1
+
+    # Move the piece downwards
+    elif direction == "DOWN":
+        current_piece.y_pos += 1
+        if not is_position_valid(current_piece, grid):  # Check if the move is valid
+            current_piece.y_pos -= 1
+
+    # Rotate the piece
+    elif direction == "ROTATE":
+        current_piece.spin += 1
+        if not is_position_valid(current_piece, grid):  # Check if the rotation is valid
+            current_piece.spin -= 1
+
+
+class TetrisEngine:
+    """ Pure-Python Tetris simulation that holds the board, the pieces, the score and the level. """
+
+    def __init__(self, rows, cols, extended=False, fast=False, seed=None, generator='uniform'):
+        self.rows = rows
+        self.cols = cols
+        self.extended = extended
+        self.fast = fast
+        self.generator_name = generator  # Piece generator from logic/randomiser.py, 'uniform' or 'bag'
+        # A seed is always chosen so the game can be replayed from it
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = None  # A ReplayRecorder (logic/replay.py) is told about every action that changes the game
+        self.profiler = None  # A FrameProfiler (logic/profiler.py) times the collision checks and row clears
+        self.reset()
+
+    def reset(self):
+        """ Start a new game on an empty board. """
+        self.board = Board(self.rows, self.cols)
+        self.score = 0
+        self.level = self.determine_level(0)
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.game_over = False
+        self.generator = create_generator(self.generator_name, self.rng, self.extended)
+        self.current_piece = self.create_piece()
+        self.next_piece = self.create_piece()
+
+    def create_piece(self):
+        # Spawn at the top-middle of the board
+        return Tetromino(self.generator.next(), self.cols // 2, 0)
+
+    def preview(self, count):
+        """ Return the next count pieces in the order they will spawn, starting with next_piece. """
+        if count < 1:
+            return []
+        spawn_x = self.cols // 2
+        return [self.next_piece] + [Tetromino(piece_id, spawn_x, 0) for piece_id in self.generator.peek(count - 1)]
+
+    def phase(self, name):
+        """ Time the block as a phase of the profiler, when the engine has one. """
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def determine_level(self, score):
+        return determine_level_hard(score) if self.fast else determine_level_easy(score)
+
+    def apply_action(self, action):
+        """ Apply a player action ("LEFT", "RIGHT", "DOWN", "ROTATE") and return True if the piece moved. """
+        piece = self.current_piece
+        before = (piece.x_pos, piece.y_pos, piece.spin)
+        with self.phase('collision'):
+            shift_piece(piece, self.board, action)
+        moved = before != (piece.x_pos, piece.y_pos, piece.spin)
+        if moved and self.recorder is not None:
+            self.recorder.record(action)  # Actions that did not move the piece change nothing, so they are not kept
+        return moved
+
+    def step(self):
+        """
+        Advance gravity by one row.
+
+        Returns None while the piece is still falling, otherwise the piece is locked
+        and the number of rows it cleared is returned.
+        """
+        if self.recorder is not None:
+            self.recorder.record("STEP")
+        piece = self.current_piece
+        piece.y_pos += 1
+        with self.phase('collision'):
+            valid = is_position_valid(piece, self.board)
+        if valid or piece.y_pos <= 0:
+            return None
+        piece.y_pos -= 1
+        return self.lock_piece()
+
+    def lock_piece(self):
+        """ Lock the current piece, clear full rows, update the score and spawn the next piece. """
+        self.board.lock(get_tetromino_positions(self.current_piece), self.current_piece.colour)
+        with self.phase('row clearing'):
+            rows_cleared = self.board.clear_full_rows()
+
+        self.lines_cleared += rows_cleared
+        self.pieces_placed += 1
+        self.score += score_cleared_rows(rows_cleared)
+        self.level = self.determine_level(self.score)
+
+        self.current_piece = self.next_piece
+        self.next_piece = self.create_piece()
+        self.game_over = self.board.is_game_over()
+        return rows_cleared
+
+    def drop_distance(self):
+        """ Return how many rows the current piece can fall before it lands. """
+        piece = self.current_piece
+        return landing_row(piece, self.board) - piece.y_pos
+
+    def ghost_positions(self):
+        """ Return the positions the current piece would lock in if it was hard dropped. """
+        piece = self.current_piece
+        landing_y = landing_row(piece, self.board)
+        return [(piece.x_pos + dx, landing_y + dy) for dx, dy in piece.rotation().cells]
+
+    def hard_drop(self):
+        """ Drop the current piece straight to where it lands and lock it, returning the number of rows cleared. """
+        if self.recorder is not None:
+            self.recorder.record("HARD_DROP")
+        piece = self.current_piece
+        with self.phase('collision'):
+            piece.y_pos = landing_row(piece, self.board)
+        return self.lock_piece()
+
+    def place(self, rotation, x_position):
+        """
+        Rotate the current piece, move it to the given column and drop it straight down from the top,
+        like the (rotation, x) moves of possible_moves. Returns the number of rows cleared, or None if the move
+        is not valid.
+        """
+        piece = self.current_piece
+        for _ in range(rotation):
+            shift_piece(piece, self.board, "ROTATE")
+        piece.x_pos = x_position
+        piece.y_pos = 0
+
+        piece.y_pos += self.drop_distance()
+        if not is_position_valid(piece, self.board):
+            return None
+        return self.lock_piece()
+
+    def play_path(self, path):
+        """
+        Apply the actions of a Placement's path (logic/ai.py) to the current piece and lock it where it ends,
+        returning the number of rows cleared. The actions are recorded like a player's.
+        """
+        for action in path:
+            self.apply_action(action)
+        return self.hard_drop()
+
+    def observe(self):
+        """ Return a snapshot of the game that is not changed by later steps. """
+        return Observation(self.board.copy(), copy.copy(self.current_piece), copy.copy(self.next_piece), self.score,
+                           self.level, self.lines_cleared, self.pieces_placed, self.game_over)
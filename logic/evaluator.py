@@ -0,0 +1,202 @@
+# File contains the board evaluation used by the AI
+# A board is scored on completed lines, board height, holes and bumpiness
+# evaluate_placements scores every candidate placement of a piece in one NumPy pass when NumPy is installed
+# Scores are remembered in a transposition table so boards that come up again are not scored twice
+
+from collections import OrderedDict
+from logic.board import Board, EMPTY_CELL
+
+try:
+    import numpy as np
+except ImportError:  # The AI still works without NumPy, one board at a time
+    np = None
+
+
+class TranspositionTable:
+    """
+    Bounded LRU cache of AI scores.
+
+    Board scores are keyed by the packed board (an int, see pack_board) and scores of a board and a
+    piece together are keyed by a (packed board, piece name) tuple. The scores depend on the weights,
+    so the table empties itself whenever it is used with different weights.
+    """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.weights = None
+        self.hits = 0
+        self.misses = 0
+
+    def set_weights(self, weights):
+        """ Empty the table if the weights differ from the ones the stored scores were computed with. """
+        weights = tuple(weights)
+        if weights != self.weights:
+            self.clear()
+            self.weights = weights
+
+    def get(self, key):
+        """ Return the stored score for the key, or None if it has not been scored yet. """
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        """ Store a score, dropping the least recently used one when the table is full. """
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Shared table used by the AI unless it is given another one
+transposition_table = TranspositionTable()
+
+
+def pack_board(grid):
+    """
+    Return a Board or a list grid as one integer with bit y * cols + x set for every filled cell.
+    One more bit above the cells records the size of the board, so boards of different sizes never share a key.
+    """
+    if isinstance(grid, Board):
+        return grid.pack() | (1 << (grid.rows * grid.cols))
+    rows, cols = len(grid), len(grid[0])
+    packed = 1 << (rows * cols)
+    for y, row in enumerate(grid):
+        for x, cell in enumerate(row):
+            if cell != EMPTY_CELL:
+                packed |= 1 << (y * cols + x)
+    return packed
+
+
+def evaluate_board(board, weights, table=transposition_table):
+    """ Score a single grid (a list of rows of colours) with the given weights. """
+    if table is not None:
+        table.set_weights(weights)
+        key = pack_board(board)
+        score = table.get(key)
+        if score is None:
+            score = score_board(board, weights)
+            table.put(key, score)
+        return score
+    return score_board(board, weights)
+
+
+def score_board(board, weights):
+    """ Score a single grid without looking at the transposition table. """
+    a, b, c, d = weights
+    completed_lines = sum(1 for row in board if all(cell != EMPTY_CELL for cell in row))
+    filled_cells_y = [y for y, row in enumerate(board) if any(cell != EMPTY_CELL for cell in row)]
+    board_height = max(filled_cells_y) - min(filled_cells_y) + 1 if filled_cells_y else 0
+    holes = sum(1 for col in zip(*board) for i, cell in enumerate(col) if
+                cell == EMPTY_CELL and any(x != EMPTY_CELL for x in col[:i]))
+    column_heights = [max([i for i, cell in enumerate(col) if cell != EMPTY_CELL], default=0) for col in zip(*board)]
+    bumpiness = sum(abs(column_heights[i] - column_heights[i + 1]) for i in range(len(column_heights) - 1))
+
+    return a * completed_lines - b * board_height - c * holes - d * bumpiness
+
+
+def occupancy_array(grid):
+    """ Convert a Board or a list grid into a 2-D boolean NumPy array of filled cells. """
+    if isinstance(grid, Board):
+        bits = np.array(grid.row_bits, dtype=np.int64)
+        return ((bits[:, None] >> np.arange(grid.cols)) & 1).astype(bool)
+    return np.array([[cell != EMPTY_CELL for cell in row] for row in grid], dtype=bool)
+
+
+def stack_placements(grid, placements):
+    """ Build one (candidates, rows, cols) occupancy array with each list of piece positions added to the grid. """
+    base = occupancy_array(grid)
+    boards = np.repeat(base[None, :, :], len(placements), axis=0)
+
+    # Gather the cells of every placement that are on the board and set them all at once
+    index = [(k, y, x) for k, positions in enumerate(placements) for x, y in positions if y > -1]
+    if index:
+        ks, ys, xs = zip(*index)
+        boards[list(ks), list(ys), list(xs)] = True
+    return boards
+
+
+def evaluate_boards(boards, weights):
+    """ Score a (candidates, rows, cols) occupancy array, giving the same results as evaluate_board for each board. """
+    a, b, c, d = weights
+    rows = boards.shape[1]
+
+    # Completed lines
+    completed_lines = boards.all(axis=2).sum(axis=1)
+
+    # Distance between the highest and the lowest row holding a block
+    filled_rows = boards.any(axis=2)
+    top_row = filled_rows.argmax(axis=1)
+    bottom_row = rows - 1 - filled_rows[:, ::-1].argmax(axis=1)
+    board_height = np.where(filled_rows.any(axis=1), bottom_row - top_row + 1, 0)
+
+    # Holes are empty cells with a block anywhere above them in the same column
+    covered = np.zeros_like(boards)
+    covered[:, 1:, :] = np.logical_or.accumulate(boards, axis=1)[:, :-1, :]
+    holes = (covered & ~boards).sum(axis=(1, 2))
+
+    # Column heights are measured as the index of the lowest block in each column
+    filled_columns = boards.any(axis=1)
+    column_heights = np.where(filled_columns, rows - 1 - boards[:, ::-1, :].argmax(axis=1), 0)
+    bumpiness = np.abs(np.diff(column_heights, axis=1)).sum(axis=1)
+
+    return a * completed_lines - b * board_height - c * holes - d * bumpiness
+
+
+def evaluate_placements(grid, placements, weights, table=transposition_table):
+    """ Score the grid with each list of piece positions added to it, returning one score per placement. """
+    if table is None:
+        return score_placements(grid, placements, weights)
+
+    # The key of each resulting board is the packed grid with the cells of the piece added
+    table.set_weights(weights)
+    base_key = pack_board(grid)
+    cols = grid.cols if isinstance(grid, Board) else len(grid[0])
+    keys = []
+    for positions in placements:
+        key = base_key
+        for x, y in positions:
+            if y > -1:
+                key |= 1 << (y * cols + x)
+        keys.append(key)
+
+    # Only the boards that are not in the table yet are scored
+    scores = [table.get(key) for key in keys]
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        new_scores = score_placements(grid, [placements[i] for i in missing], weights)
+        for i, score in zip(missing, new_scores):
+            scores[i] = score
+            table.put(keys[i], score)
+    return scores
+
+
+def score_placements(grid, placements, weights):
+    """ Score every placement without looking at the transposition table. """
+    if np is None or not placements:
+        if isinstance(grid, Board):
+            # None marks a filled cell, evaluate_board only compares cells against EMPTY_CELL
+            grid = [[None if grid.is_filled(x, y) else EMPTY_CELL for x in range(grid.cols)] for y in range(grid.rows)]
+        scores = []
+        for positions in placements:
+            test_grid = [list(row) for row in grid]
+            for x, y in positions:
+                if y > -1:
+                    test_grid[y][x] = None
+            scores.append(score_board(test_grid, weights))
+        return scores
+    return evaluate_boards(stack_placements(grid, placements), weights).tolist()
@@ -0,0 +1,95 @@
+# File holds the fonts and rendered text shared by model.py and view.py
+# Fonts are looked up once per (name, size, bold) and kept for the whole session
+# Rendered text surfaces are kept in a LRU cache so labels that do not change are only rasterised once
+
+from collections import OrderedDict
+import pygame
+
+TEXT_CACHE_SIZE = 256  # Number of rendered text surfaces kept
+
+
+class CachedFont:
+    """ Wraps a pygame font so every text it renders goes through the shared text cache. """
+
+    def __init__(self, key, font):
+        self.key = key
+        self.font = font
+
+    def render(self, text, antialias, colour, background=None):
+        """ Same as pygame.font.Font.render, the returned surface is shared so it must not be drawn on. """
+        return text_cache.render(self, text, antialias, colour, background)
+
+    def __getattr__(self, name):
+        # Everything else (size, get_height, ...) is passed on to the pygame font
+        return getattr(self.font, name)
+
+
+class TextCache:
+    """ LRU cache of rendered text surfaces keyed by font, text and colours. """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, colour, background=None):
+        key = (font.key, text, bool(antialias), tuple(colour), tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.font.render(text, antialias, colour)
+        else:
+            surface = font.font.render(text, antialias, colour, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Drop the least recently used text
+        return surface
+
+
+# Fonts loaded so far, keyed by (name, size, bold)
+fonts = {}
+font_hits = 0
+font_misses = 0
+text_cache = TextCache()
+
+
+def get_font(name, size, bold=False):
+    """
+    Return the shared font for (name, size, bold).
+    name is a system font name such as 'helvetica', a .ttf file, or None for the pygame default font.
+    """
+    global font_hits, font_misses
+    key = (name, size, bold)
+    font = fonts.get(key)
+    if font is not None:
+        font_hits += 1
+        return font
+
+    font_misses += 1
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if name is None or name.endswith('.ttf'):
+        pygame_font = pygame.font.Font(name, size)
+        pygame_font.set_bold(bold)
+    else:
+        pygame_font = pygame.font.SysFont(name, size, bold=bold)
+    font = fonts[key] = CachedFont(key, pygame_font)
+    return font
+
+
+def font_cache_stats():
+    """ Return the number of fonts and texts cached and the hit rates of both caches. """
+    font_lookups = font_hits + font_misses
+    text_lookups = text_cache.hits + text_cache.misses
+    return {
+        'fonts': len(fonts),
+        'font_hit_rate': font_hits / font_lookups if font_lookups else 0.0,
+        'texts': len(text_cache.surfaces),
+        'text_hit_rate': text_cache.hits / text_lookups if text_lookups else 0.0,
+    }
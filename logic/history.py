@@ -0,0 +1,101 @@
+# File contains the score history, a SQLite database with one row for every finished game
+# Games are grouped into modes by board size, extended pieces, fast speed and AI play
+# An index on (mode, score) lets the score screen read one page of a leaderboard without loading the others,
+# so the history can hold tens of thousands of self-play games
+# Nothing in this file imports pygame so the self-play runner can record its games as well
+
+import sqlite3
+import time
+from collections import namedtuple
+
+Mode = namedtuple('Mode', ['rows', 'cols', 'extended', 'fast', 'ai'])
+GameResult = namedtuple('GameResult', ['name', 'score', 'lines', 'pieces', 'seconds', 'played_at'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    pieces INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    extended INTEGER NOT NULL,
+    fast INTEGER NOT NULL,
+    ai INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_mode_and_score ON games (rows, cols, extended, fast, ai, score DESC, id);
+"""
+
+MODE_FILTER = "rows = ? AND cols = ? AND extended = ? AND fast = ? AND ai = ?"
+
+
+def mode_label(mode):
+    """ Describe a mode for the score screen, e.g. '20x10 Normal Game, Normal Speed, Player'. """
+    return (f"{mode.rows}x{mode.cols} {'Extended' if mode.extended else 'Normal'} Game, "
+            f"{'Fast' if mode.fast else 'Normal'} Speed, {'AI' if mode.ai else 'Player'}")
+
+
+class ScoreHistory:
+    """ Records finished games and answers leaderboard queries one page at a time. """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.connection = None
+
+    def connect(self):
+        """ Open the database the first time it is used, creating the table and index if needed. """
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.filename)
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def record_game(self, name, mode, score, lines, pieces, seconds, played_at=None):
+        self.record_games([(name, mode, score, lines, pieces, seconds, played_at)])
+
+    def record_games(self, games):
+        """ Record many (name, mode, score, lines, pieces, seconds, played_at) games in one transaction. """
+        now = time.time()
+        rows = [(name, score, lines, pieces, *(int(value) for value in mode), seconds,
+                 played_at if played_at is not None else now)
+                for name, mode, score, lines, pieces, seconds, played_at in games]
+        with self.connect() as connection:
+            connection.executemany(
+                "INSERT INTO games (name, score, lines, pieces, rows, cols, extended, fast, ai, seconds, played_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def modes(self):
+        """ Return every mode that has at least one game, with the number of games played in it. """
+        cursor = self.connect().execute(
+            "SELECT rows, cols, extended, fast, ai, COUNT(*) FROM games GROUP BY rows, cols, extended, fast, ai")
+        return [(Mode(rows, cols, bool(extended), bool(fast), bool(ai)), count)
+                for rows, cols, extended, fast, ai, count in cursor]
+
+    def count(self, mode):
+        cursor = self.connect().execute(f"SELECT COUNT(*) FROM games WHERE {MODE_FILTER}", tuple(map(int, mode)))
+        return cursor.fetchone()[0]
+
+    def top(self, mode, limit=10, offset=0):
+        """ Return one page of the leaderboard of a mode as GameResults, from the highest score down. """
+        cursor = self.connect().execute(
+            f"SELECT name, score, lines, pieces, seconds, played_at FROM games WHERE {MODE_FILTER} "
+            f"ORDER BY score DESC, id LIMIT ? OFFSET ?", (*map(int, mode), limit, offset))
+        return [GameResult(*row) for row in cursor]
+
+
+# Score histories by file name, so the game and the score screen share one connection
+score_histories = {}
+
+
+def get_score_history(filename='scores.db'):
+    history = score_histories.get(filename)
+    if history is None:
+        history = score_histories[filename] = ScoreHistory(filename)
+    return history
@@ -0,0 +1,78 @@
+# File contains the AI planner that searches for moves on a worker thread
+# The game loop sends the board and pieces through a request queue and picks finished plans up from a result queue
+# After planning the current piece the worker also plans the next piece on the board it expects to follow,
+# looking one piece further ahead when the piece after the next one is already known from the preview queue
+
+import copy
+import queue
+import threading
+from logic.ai import lookahead_move
+from logic.evaluator import TranspositionTable
+
+
+class AIPlanner:
+    """ Runs lookahead_move on a worker thread so the game loop keeps drawing frames while the AI thinks. """
+
+    def __init__(self, weights, beam_width=4, time_budget=None):
+        self.weights = list(weights)
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.plans = {}  # (packed board, piece name) -> planned Placement of the piece where it spawned
+        self.table = TranspositionTable()  # The worker keeps its own table, the game loop may use the shared one
+        self.thread = threading.Thread(target=self.run, name="AIPlanner", daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def plan_key(board, piece):
+        return board.pack(), piece.name
+
+    def request_plan(self, board, piece, next_piece, following_piece=None):
+        """
+        Ask the worker to plan the piece that has just spawned, the arguments are copied so the game can go on.
+        following_piece is the piece after next_piece, when the game knows it.
+        """
+        self.requests.put((board.copy(colours=False), copy.copy(piece), copy.copy(next_piece),
+                           copy.copy(following_piece)))
+
+    def get_plan(self, board, piece):
+        """ Return the plan for the piece on this board if the worker has finished it, otherwise None. """
+        while True:
+            try:
+                key, move = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.plans[key] = move
+            if len(self.plans) > 32:
+                self.plans.pop(next(iter(self.plans)))  # Forget the oldest plan
+        return self.plans.get(self.plan_key(board, piece))
+
+    def stop(self):
+        self.requests.put(None)
+
+    def run(self):
+        """ Worker loop, only the newest request is planned when several are waiting. """
+        while True:
+            request = self.requests.get()
+            while request is not None and not self.requests.empty():
+                request = self.requests.get_nowait()
+            if request is None:
+                return
+
+            board, piece, next_piece, following_piece = request
+            move = lookahead_move(piece, next_piece, board, self.weights, self.beam_width, self.time_budget, self.table)
+            self.results.put((self.plan_key(board, piece), move))
+            if move is None:
+                continue
+
+            # Plan the next piece on the board the planned move should leave behind
+            # Without the piece that follows it this plan only places one piece
+            expected_board = board.copy(colours=False)
+            expected_board.lock(move.positions, None)
+            expected_board.clear_full_rows()
+            next_move = lookahead_move(next_piece, following_piece, expected_board, self.weights, self.beam_width,
+                                       self.time_budget, self.table)
+            key = self.plan_key(expected_board, next_piece)
+            if next_move is not None and self.requests.empty():
+                self.results.put((key, next_move))
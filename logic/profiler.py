@@ -0,0 +1,104 @@
+# File contains the frame profiler behind the performance overlay (F3 in game)
+# Every frame is split into phases, each phase is timed with its own time only, so a phase that runs inside
+# another one (collision checks during the AI or a gravity step) is not counted twice and the phases of a frame
+# add up to the whole frame
+# The last PROFILER_WINDOW frames are kept for rolling percentiles, and every frame can be kept for a trace file
+# Nothing in this file imports pygame so the engine can report its phases when it runs headless
+
+import csv
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Phases in the order they are shown, 'other' is the time of a frame spent outside every other phase
+PHASES = ('wait', 'events', 'simulation', 'ai', 'collision', 'row clearing', 'grid', 'render', 'observers',
+          'hud', 'display', 'other')
+FRAME = 'frame'  # The whole frame, the sum of its phases
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """ Nearest-rank percentile of a sorted list of values. """
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+class FrameProfiler:
+    """ Times the phases of every frame and keeps the last window frames of each phase in milliseconds. """
+
+    def __init__(self, window=300, trace=False):
+        self.window = window
+        self.history = {phase: deque(maxlen=window) for phase in PHASES + (FRAME,)}
+        self.frames = [] if trace else None  # (start, milliseconds of each phase..., frame) of every frame
+        self.stack = []  # Phases entered and not exited yet, the last one is being timed
+        self.started = self.last = self.frame_start = time.perf_counter()
+        self.times = dict.fromkeys(PHASES, 0.0)  # Seconds spent in each phase in the current frame
+
+    def enter(self, phase):
+        """ Start timing phase, pausing the phase it runs inside of. """
+        now = time.perf_counter()
+        self.times[self.stack[-1] if self.stack else 'other'] += now - self.last
+        self.stack.append(phase)
+        self.last = now
+
+    def exit(self):
+        """ Stop timing the phase entered last and carry on timing the phase around it. """
+        now = time.perf_counter()
+        self.times[self.stack.pop()] += now - self.last
+        self.last = now
+
+    @contextmanager
+    def phase(self, phase):
+        self.enter(phase)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def end_frame(self):
+        """ Close the current frame, adding the time of each of its phases to the rolling history. """
+        now = time.perf_counter()
+        self.times[self.stack[-1] if self.stack else 'other'] += now - self.last
+        self.last = now
+
+        milliseconds = [self.times[phase] * 1000 for phase in PHASES]
+        total = sum(milliseconds)
+        for phase, value in zip(PHASES, milliseconds):
+            self.history[phase].append(value)
+        self.history[FRAME].append(total)
+        if self.frames is not None:
+            self.frames.append(((self.frame_start - self.started) * 1000, *milliseconds, total))
+
+        self.frame_start = now
+        self.times = dict.fromkeys(PHASES, 0.0)
+
+    def restart_frame(self):
+        """ Forget the time spent so far in the current frame, e.g. while a pause dialog was open. """
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.last = self.frame_start = time.perf_counter()
+
+    def summary(self):
+        """ Return {phase: {'p50': ..., 'p95': ..., 'p99': ..., 'max': ...}} over the last window frames. """
+        summary = {}
+        for phase, values in self.history.items():
+            values = sorted(values)
+            summary[phase] = {f"p{percent}": percentile(values, percent) for percent in PERCENTILES}
+            summary[phase]['max'] = values[-1] if values else 0.0
+        return summary
+
+    def save_trace(self, filename):
+        """ Write every frame to filename, as JSON if it ends with .json and as CSV otherwise. """
+        columns = ('start',) + PHASES + (FRAME,)
+        frames = self.frames or []
+        if filename.endswith('.json'):
+            with open(filename, 'w') as f:
+                json.dump({'unit': 'ms', 'window': self.window, 'summary': self.summary(),
+                           'frames': [dict(zip(columns, frame)) for frame in frames]}, f, indent=1)
+        else:
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows([f"{value:.3f}" for value in frame] for frame in frames)
@@ -0,0 +1,103 @@
+# File contains the piece generators that choose which tetromino comes next
+# 'uniform' picks every piece independently, 'bag' deals every piece type once in a shuffled bag before refilling
+# In the extended game the bag holds the extended tetrominoes as well
+# Upcoming pieces are kept as shape ids in a ring buffer allocated once, so spawning a piece never builds a list
+# and the pieces after the next one can be shown or planned for
+
+from abc import ABC, abstractmethod
+from logic.tetromino import TetrominoFactory
+
+GENERATORS = ('uniform', 'bag')
+
+# Tetromino types in play without and with the extended game, the extended types follow the normal ones
+PIECE_NAMES = {
+    False: tuple(TetrominoFactory.tetromino_classes),
+    True: tuple(TetrominoFactory.tetromino_classes) + tuple(
+        name for name in TetrominoFactory.extended_tetromino_classes if name not in TetrominoFactory.tetromino_classes),
+}
+
+
+def piece_names(extended=False):
+    return PIECE_NAMES[bool(extended)]
+
+
+def shape_id(name):
+    classes = {**TetrominoFactory.tetromino_classes, **TetrominoFactory.extended_tetromino_classes}
+    return classes[name].SHAPE_ID
+
+
+class PieceGenerator(ABC):
+    """ Base class of the generators, refill() fills the free space at the end of the ring buffer with shape ids. """
+
+    def __init__(self, rng, extended=False, size=64):
+        self.rng = rng
+        self.shape_ids = [shape_id(name) for name in piece_names(extended)]
+        self.buffer = [0] * size
+        self.start = 0  # Index of the next piece in the buffer
+        self.count = 0  # Number of pieces waiting in the buffer
+
+    def push(self, piece_id):
+        size = len(self.buffer)
+        self.buffer[(self.start + self.count) % size] = piece_id
+        self.count += 1
+
+    def space(self):
+        return len(self.buffer) - self.count
+
+    @abstractmethod
+    def refill(self):
+        pass
+
+    def next(self):
+        """ Return the shape id of the next piece. """
+        if not self.count:
+            self.refill()
+        piece_id = self.buffer[self.start]
+        self.start = (self.start + 1) % len(self.buffer)
+        self.count -= 1
+        return piece_id
+
+    def peek(self, count):
+        """ Return the shape ids of the next count pieces without taking them out of the stream. """
+        if count > len(self.buffer):
+            raise ValueError(f"Can only look {len(self.buffer)} pieces ahead")
+        if self.count < count:
+            self.refill()
+        size = len(self.buffer)
+        return [self.buffer[(self.start + i) % size] for i in range(count)]
+
+
+class UniformGenerator(PieceGenerator):
+    """ Every piece type is equally likely every time, the same sequence the game always had for a seed. """
+
+    def refill(self):
+        choice, shape_ids = self.rng.choice, self.shape_ids
+        for _ in range(self.space()):
+            self.push(choice(shape_ids))
+
+
+class BagGenerator(PieceGenerator):
+    """ Deals each piece type once in a random order, then shuffles a new bag. """
+
+    def __init__(self, rng, extended=False, size=64):
+        super().__init__(rng, extended, size)
+        self.bag = list(self.shape_ids)  # Shuffled in place for every new bag
+        self.dealt = len(self.bag)  # Pieces of the bag already pushed, the rest wait for the next refill
+
+    def refill(self):
+        bag = self.bag
+        for _ in range(self.space()):
+            if self.dealt == len(bag):
+                self.rng.shuffle(bag)
+                self.dealt = 0
+            self.push(bag[self.dealt])
+            self.dealt += 1
+
+
+def create_generator(name, rng, extended=False):
+    """ Return the piece generator called name ('uniform' or 'bag') drawing from the random generator rng. """
+    if name == 'uniform':
+        return UniformGenerator(rng, extended)
+    if name == 'bag':
+        return BagGenerator(rng, extended)
+    raise ValueError(f"Unknown piece generator: {name}")
@@ -0,0 +1,150 @@
+# File contains the replay recorder and player
+# A replay is the seed and settings of a game plus every engine action that changed the game, stamped with the
+# simulation tick it happened on. Replaying the actions on a TetrisEngine with the same seed rebuilds the game exactly
+# Nothing in this file imports pygame so replays can be checked headlessly, far faster than real time
+#
+# Check a replay:  python -m logic.replay replays/<file>.replay
+
+import argparse
+import struct
+import time
+from collections import namedtuple
+from logic.engine import TetrisEngine
+from logic.randomiser import GENERATORS
+
+# Actions in the order of their codes in the file
+ACTIONS = ("LEFT", "RIGHT", "DOWN", "ROTATE", "STEP", "HARD_DROP")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+WAIT_CODE = 255  # Entry that only moves time on, used when more than 65535 ticks pass between two actions
+
+MAGIC = b'TRPL'
+VERSION = 2
+# magic, version, seed, rows, cols, extended, fast, piece generator, milliseconds per tick,
+# score, lines, pieces, number of entries
+HEADER = struct.Struct('<4sBQBB??BBIIII')
+# ticks since the previous entry, action code
+ENTRY = struct.Struct('<HB')
+
+Replay = namedtuple('Replay', ['seed', 'rows', 'cols', 'extended', 'fast', 'generator', 'step', 'score', 'lines',
+                               'pieces', 'actions'])
+
+
+class ReplayRecorder:
+    """
+    Records the actions applied to an engine. The engine reports its actions once it is given the recorder
+    as engine.recorder, and the game advances tick every step of step milliseconds.
+    """
+
+    def __init__(self, engine, step):
+        self.engine = engine
+        self.step = step
+        self.tick = 0
+        self.actions = []  # (tick, action) pairs
+
+    def record(self, action):
+        self.actions.append((self.tick, action))
+
+    def replay(self):
+        """ Return the game recorded so far as a Replay. """
+        engine = self.engine
+        return Replay(engine.seed, engine.rows, engine.cols, engine.extended, engine.fast, engine.generator_name,
+                      self.step, engine.score, engine.lines_cleared, engine.pieces_placed, list(self.actions))
+
+
+def apply_action(engine, action):
+    """ Apply one recorded action to the engine. """
+    if action == "STEP":
+        engine.step()
+    elif action == "HARD_DROP":
+        engine.hard_drop()
+    else:
+        engine.apply_action(action)
+
+
+def replay_to_bytes(replay):
+    entries = bytearray()
+    count = 0
+    last_tick = 0
+    for tick, action in replay.actions:
+        delta = tick - last_tick
+        while delta > 0xFFFF:
+            entries += ENTRY.pack(0xFFFF, WAIT_CODE)
+            delta -= 0xFFFF
+            count += 1
+        entries += ENTRY.pack(delta, ACTION_CODES[action])
+        count += 1
+        last_tick = tick
+    header = HEADER.pack(MAGIC, VERSION, replay.seed, replay.rows, replay.cols, replay.extended, replay.fast,
+                         GENERATORS.index(replay.generator), replay.step, replay.score, replay.lines, replay.pieces,
+                         count)
+    return header + bytes(entries)
+
+
+def replay_from_bytes(data):
+    (magic, version, seed, rows, cols, extended, fast, generator, step, score, lines, pieces,
+     count) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a replay file, or a replay from another version of the game")
+
+    actions = []
+    tick = 0
+    for delta, code in ENTRY.iter_unpack(data[HEADER.size:HEADER.size + count * ENTRY.size]):
+        tick += delta
+        if code != WAIT_CODE:
+            actions.append((tick, ACTIONS[code]))
+    return Replay(seed, rows, cols, extended, fast, GENERATORS[generator], step, score, lines, pieces, actions)
+
+
+def save_replay(filename, replay):
+    with open(filename, 'wb') as f:
+        f.write(replay_to_bytes(replay))
+
+
+def load_replay(filename):
+    with open(filename, 'rb') as f:
+        return replay_from_bytes(f.read())
+
+
+def create_engine(replay):
+    """ Return a new engine in the state the recorded game started in. """
+    return TetrisEngine(replay.rows, replay.cols, extended=replay.extended, fast=replay.fast, seed=replay.seed,
+                        generator=replay.generator)
+
+
+def simulate(replay):
+    """ Replay every action as fast as possible and return the engine at the end of the game. """
+    engine = create_engine(replay)
+    for _, action in replay.actions:
+        apply_action(engine, action)
+    return engine
+
+
+def matches(replay, engine):
+    """ Check that a re-simulated game ended with the recorded results. """
+    return (engine.score, engine.lines_cleared, engine.pieces_placed) == (replay.score, replay.lines, replay.pieces)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate recorded games and check they end the same way.")
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+
+    all_match = True
+    for filename in args.files:
+        replay = load_replay(filename)
+        start_time = time.perf_counter()
+        engine = simulate(replay)
+        elapsed_time = time.perf_counter() - start_time
+
+        game_time = (replay.actions[-1][0] if replay.actions else 0) * replay.step / 1000
+        match = matches(replay, engine)
+        all_match = all_match and match
+        print(f"{filename}: score {engine.score} lines {engine.lines_cleared} pieces {engine.pieces_placed} "
+              f"{'matches' if match else 'DIFFERS from'} the recording, "
+              f"{game_time:.0f} s of play in {elapsed_time * 1000:.1f} ms "
+              f"({game_time / max(elapsed_time, 1e-9):,.0f}x real time)")
+    return 0 if all_match else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
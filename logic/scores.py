@@ -0,0 +1,92 @@
+# File contains the high score table shared by the game and the score screen
+# The top scores are kept in memory in a heap, so every screen sees a new score as soon as it is added
+# The file is rewritten to a temporary file that then replaces scores.txt, so a crash mid-write never loses the table
+# Each line of the file is "<score> <name>", the name is everything after the first space so it may contain spaces
+
+import heapq
+import itertools
+import os
+import tempfile
+
+TOP_SCORES = 10  # Number of scores kept
+
+
+class ScoreStore:
+    """ The top scores of a score file, loaded once and written back atomically after every new score. """
+
+    def __init__(self, filename, size=TOP_SCORES):
+        self.filename = filename
+        self.size = size
+        # Min-heap of (score, -order, name), the lowest score and among equal scores the newest one is heap[0]
+        self.heap = None
+        self.order = itertools.count()
+
+    def load(self):
+        """ Read the score file the first time the scores are needed. """
+        if self.heap is not None:
+            return
+        self.heap = []
+        try:
+            with open(self.filename, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            score, _, name = line.rstrip('\n').partition(' ')
+            try:
+                score = int(score)
+            except ValueError:
+                continue  # Skip lines that are not scores rather than losing the whole table
+            self.push(score, name)
+
+    def push(self, score, name):
+        entry = (score, -next(self.order), name)
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def qualifies(self, score):
+        """ Check if the score would make it into the table. """
+        self.load()
+        return len(self.heap) < self.size or score > self.heap[0][0]
+
+    def add(self, score, name):
+        """ Add a score and save the table, names cannot hold line breaks so they are replaced by spaces. """
+        self.load()
+        name = ' '.join(name.splitlines())
+        self.push(score, name)
+        self.save()
+
+    def top(self, count=None):
+        """ Return the (name, score) pairs from the highest score down, equal scores keep the order they were added. """
+        self.load()
+        entries = sorted(self.heap, reverse=True)[:count]
+        return [(name, score) for score, _, name in entries]
+
+    def save(self):
+        """ Write the table to a temporary file next to the score file, then move it over the score file. """
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        file_descriptor, temporary_name = tempfile.mkstemp(prefix='.scores-', dir=directory, text=True)
+        try:
+            with os.fdopen(file_descriptor, 'w') as f:
+                for name, score in self.top():
+                    f.write(f"{score} {name}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_name, self.filename)
+        except BaseException:
+            os.remove(temporary_name)
+            raise
+
+
+# Score stores by file name, so every part of the game that uses a file shares one table
+score_stores = {}
+
+
+def get_score_store(filename='scores.txt'):
+    store = score_stores.get(filename)
+    if store is None:
+        store = score_stores[filename] = ScoreStore(filename)
+    return store
@@ -0,0 +1,167 @@
+# File contains the self-play runner used to measure and tune the AI weights
+# Headless games are played with TetrisEngine on a multiprocessing pool, one game per task
+# Every weight vector plays the same seeded piece sequences so the results can be compared fairly
+#
+# Measure weights:    python -m logic.selfplay --games 50 --weights 1000 500 100 300
+# Tune the weights:   python -m logic.selfplay --optimise cem --iterations 10 --population 16 --output ai_weights.json
+
+import argparse
+import multiprocessing
+import random
+import time
+from logic.ai import lookahead_move, save_weights
+from logic.engine import TetrisEngine
+from logic.evaluator import TranspositionTable
+from logic.history import Mode, get_score_history
+from logic.randomiser import GENERATORS
+
+DEFAULT_WEIGHTS = [1000, 500, 100, 300]  # Completed Lines | Board Height | Holes | Bumpiness
+
+
+def play_game(task):
+    """ Play one headless game and return its results, task is (weights, seed, settings). """
+    weights, seed, settings = task
+    engine = TetrisEngine(settings['rows'], settings['cols'], extended=settings['extended'], seed=seed,
+                          generator=settings['generator'])
+    table = TranspositionTable()
+    beam_width = settings['beam_width'] if settings['depth'] > 1 else 0
+
+    start_time = time.perf_counter()
+    while not engine.game_over and engine.pieces_placed < settings['max_pieces']:
+        move = lookahead_move(engine.current_piece, engine.next_piece, engine.board, weights, beam_width, table=table)
+        if move is None:
+            break
+        engine.play_path(move.path)
+    return {
+        'score': engine.score,
+        'lines': engine.lines_cleared,
+        'pieces': engine.pieces_placed,
+        'seconds': time.perf_counter() - start_time,
+    }
+
+
+def summarise(results):
+    """ Average the results of a list of games. """
+    count = len(results)
+    return {
+        'games': count,
+        'score': sum(result['score'] for result in results) / count,
+        'lines': sum(result['lines'] for result in results) / count,
+        'pieces': sum(result['pieces'] for result in results) / count,
+    }
+
+
+def evaluate_weights(pool, weight_vectors, settings):
+    """ Play settings['games'] games with every weight vector and return one summary per vector. """
+    games = settings['games']
+    seeds = [settings['seed'] + i for i in range(games)]
+    tasks = [(list(weights), seed, settings) for weights in weight_vectors for seed in seeds]
+    results = pool.map(play_game, tasks, chunksize=1)
+    if settings['history']:
+        # Every game is added to the score history in one transaction
+        mode = Mode(settings['rows'], settings['cols'], settings['extended'], False, True)
+        get_score_history(settings['history']).record_games(
+            ('self-play', mode, result['score'], result['lines'], result['pieces'], result['seconds'], None)
+            for result in results)
+    return [summarise(results[i * games:(i + 1) * games]) for i in range(len(weight_vectors))]
+
+
+def print_summary(weights, summary):
+    print(f"weights {[round(w, 1) for w in weights]}: lines {summary['lines']:.1f} "
+          f"score {summary['score']:.0f} pieces {summary['pieces']:.1f}")
+
+
+def random_search(pool, settings, rng, iterations, population, start_weights):
+    """ Try random changes around the best weights so far and keep any that clear more lines. """
+    best_weights = list(start_weights)
+    best_summary = evaluate_weights(pool, [best_weights], settings)[0]
+    print_summary(best_weights, best_summary)
+
+    for iteration in range(iterations):
+        candidates = [[max(0.0, w * rng.uniform(0.5, 1.5)) for w in best_weights] for _ in range(population)]
+        for weights, summary in zip(candidates, evaluate_weights(pool, candidates, settings)):
+            if summary['lines'] > best_summary['lines']:
+                best_weights, best_summary = weights, summary
+        print(f"iteration {iteration + 1}:", end=' ')
+        print_summary(best_weights, best_summary)
+    return best_weights, best_summary
+
+
+def cross_entropy(pool, settings, rng, iterations, population, start_weights, elite_fraction=0.25):
+    """ Sample weights from a normal distribution and move it towards the samples that clear the most lines. """
+    means = [float(w) for w in start_weights]
+    deviations = [max(abs(w) * 0.5, 1.0) for w in start_weights]
+    elite_count = max(2, int(population * elite_fraction))
+    best_weights, best_summary = None, None
+
+    for iteration in range(iterations):
+        candidates = [[max(0.0, rng.gauss(mean, deviation)) for mean, deviation in zip(means, deviations)]
+                      for _ in range(population)]
+        summaries = evaluate_weights(pool, candidates, settings)
+        ranked = sorted(zip(candidates, summaries), key=lambda pair: pair[1]['lines'], reverse=True)
+        if best_summary is None or ranked[0][1]['lines'] > best_summary['lines']:
+            best_weights, best_summary = ranked[0]
+
+        # Fit the distribution to the elite samples
+        elite = [weights for weights, _ in ranked[:elite_count]]
+        means = [sum(column) / elite_count for column in zip(*elite)]
+        deviations = [max((sum((w - mean) ** 2 for w in column) / elite_count) ** 0.5, 1.0)
+                      for column, mean in zip(zip(*elite), means)]
+        print(f"iteration {iteration + 1}:", end=' ')
+        print_summary(best_weights, best_summary)
+    return best_weights, best_summary
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless Tetris games to measure or tune the AI weights.")
+    parser.add_argument('--games', type=int, default=20, help="games played by every weight vector")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game, game i uses seed + i")
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--extended', action='store_true', help="include the extended tetrominoes")
+    parser.add_argument('--generator', choices=GENERATORS, default='uniform', help="piece generator")
+    parser.add_argument('--depth', type=int, choices=[1, 2], default=2, help="pieces placed by the AI search")
+    parser.add_argument('--beam', type=int, default=4, help="beam width of the two piece search")
+    parser.add_argument('--max-pieces', type=int, default=1000, help="stop a game after this many pieces")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help="worker processes")
+    parser.add_argument('--weights', type=float, nargs=4, default=DEFAULT_WEIGHTS,
+                        metavar=('LINES', 'HEIGHT', 'HOLES', 'BUMPINESS'), help="weights to measure or start from")
+    parser.add_argument('--optimise', choices=['random', 'cem'], help="tune the weights instead of measuring them")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--population', type=int, default=16, help="weight vectors tried per iteration")
+    parser.add_argument('--output', help="file the best weights are saved to, e.g. ai_weights.json")
+    parser.add_argument('--history', help="score history database every game is recorded in, e.g. scores.db")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    settings = {
+        'games': args.games, 'seed': args.seed, 'rows': args.rows, 'cols': args.cols, 'extended': args.extended,
+        'generator': args.generator, 'history': args.history,
+        'depth': args.depth, 'beam_width': args.beam, 'max_pieces': args.max_pieces,
+    }
+
+    start_time = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        if args.optimise is None:
+            weights = args.weights
+            summary = evaluate_weights(pool, [weights], settings)[0]
+            games_played = summary['games']
+            print_summary(weights, summary)
+        else:
+            rng = random.Random(args.seed)
+            optimiser = random_search if args.optimise == 'random' else cross_entropy
+            weights, summary = optimiser(pool, settings, rng, args.iterations, args.population, args.weights)
+            games_played = args.games * (args.population * args.iterations + (args.optimise == 'random'))
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"{games_played} games in {elapsed_time:.1f} seconds on {args.workers} workers "
+          f"({games_played / elapsed_time:.2f} games per second)")
+    if args.output:
+        save_weights(args.output, weights, summary)
+        print(f"Saved the weights to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 # File is for defining Tetrominoes AKA Tetris Shapes
 # Normal shapes are defined followed by the extended game shapes
 # The classes create an instance for the tetromino and assign them a colour
-# The shapes are converted in the convert_shape function in the controller
+# The shapes are compiled once at import into tables of cell offsets for every rotation
+
+from collections import namedtuple
 
 # Defining standard tetromino colours
 Green = (0, 255, 0)
@@ -209,18 +211,87 @@ class E_LTetromino:
 
     COLOUR = Blue
 
+# One compiled rotation of a shape
+# cells are the (dx, dy) offsets of the blocks from the tetromino x_pos and y_pos
+# left/right and top/bottom are the smallest and largest dx and dy of the cells
+# profile holds the largest dy of each column from left to right (the bottom edge of the shape)
+# row_masks holds a (dy, bitmask) pair for each row of the shape, bit 0 of the mask is the left column
+Rotation = namedtuple('Rotation', ['cells', 'width', 'height', 'left', 'right', 'top', 'bottom', 'profile', 'row_masks'])
+
+
+def compile_rotations(shapes):
+    """ Convert the 5x5 'O'/'*' shape formats into a tuple of Rotation tables. """
+    rotations = []
+    for shape in shapes:
+        # The 'O' blocks are offset so the tetromino x_pos sits in the third column and y_pos below the last row
+        cells = tuple((j - 2, i - 4) for i, row in enumerate(shape) for j, block in enumerate(row) if block == 'O')
+        xs = [dx for dx, _ in cells]
+        ys = [dy for _, dy in cells]
+        left, right, top, bottom = min(xs), max(xs), min(ys), max(ys)
+        profile = tuple(max(dy for dx, dy in cells if dx == column) for column in range(left, right + 1))
+        row_masks = tuple((row, sum(1 << (dx - left) for dx, dy in cells if dy == row)) for row in range(top, bottom + 1))
+        rotations.append(Rotation(cells, right - left + 1, bottom - top + 1, left, right, top, bottom, profile, row_masks))
+    return tuple(rotations)
+
+
+# Shape data shared by every piece of one type, pieces only store the index of their type in PIECE_TYPES
+PieceType = namedtuple('PieceType', ['name', 'shapes', 'colour', 'rotations'])
+PIECE_TYPES = []
+
+
+def register_piece_type(name, shapes, colour):
+    """ Compile a shape and add it to PIECE_TYPES, returning the shape id pieces of this type are created with. """
+    PIECE_TYPES.append(PieceType(name, shapes, colour, compile_rotations(shapes)))
+    return len(PIECE_TYPES) - 1
+
+
 class Tetromino:
-    def __init__(self, x_pos, y_pos, shape, colour):
-        self.spin = 0
+    """
+    A piece is only its (shape id, spin, x, y) state, the shape, colour and rotation tables are looked up
+    in PIECE_TYPES. The slots keep each piece small and a piece can be reused with set_state in search loops.
+    """
+    __slots__ = ('shape_id', 'spin', 'x_pos', 'y_pos')
+
+    def __init__(self, shape_id, x_pos, y_pos, spin=0):
+        self.shape_id = shape_id
+        self.spin = spin
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+
+    @property
+    def name(self):
+        """ The TetrominoFactory type ('I', 'L', ..., 'E_L'), used to tell pieces apart. """
+        return PIECE_TYPES[self.shape_id].name
+
+    @property
+    def shape(self):
+        return PIECE_TYPES[self.shape_id].shapes
+
+    @property
+    def colour(self):
+        return PIECE_TYPES[self.shape_id].colour
+
+    @property
+    def rotations(self):
+        return PIECE_TYPES[self.shape_id].rotations
+
+    def rotation(self):
+        """ Return the compiled Rotation of the current spin. """
+        rotations = PIECE_TYPES[self.shape_id].rotations
+        return rotations[self.spin % len(rotations)]
+
+    def state(self):
+        return self.shape_id, self.spin, self.x_pos, self.y_pos
+
+    def set_state(self, spin, x_pos, y_pos):
+        """ Move and turn the piece in place, so a search can try many positions with one piece. """
+        self.spin = spin
         self.x_pos = x_pos
         self.y_pos = y_pos
-        self.shape = shape
-        self.colour = colour
+        return self
 
     def copy(self):
-        return Tetromino(self.x_pos, self.y_pos, self.shape, self.spin)
-    def width(self):
-        return len(self.shape[0])
+        return Tetromino(self.shape_id, self.x_pos, self.y_pos, self.spin)
 
 class TetrominoFactory:
     """ TetrominoFactory is responsible for creating Tetrominoes """
@@ -248,6 +319,13 @@ class TetrominoFactory:
         """Static method to create a Tetromino instance"""
         if type in TetrominoFactory.tetromino_classes:
             tetromino_class = TetrominoFactory.tetromino_classes[type]
-            return Tetromino(x_pos, y_pos, tetromino_class.SHAPES, tetromino_class.COLOUR)
+            return Tetromino(tetromino_class.SHAPE_ID, x_pos, y_pos)
         else:
             raise ValueError(f"Unknown Tetromino type: {type}")
+
+
+# Compile every shape once at import so placing a piece never re-parses its character format
+for name, tetromino_class in (*TetrominoFactory.tetromino_classes.items(),
+                              *TetrominoFactory.extended_tetromino_classes.items()):
+    tetromino_class.SHAPE_ID = register_piece_type(name, tetromino_class.SHAPES, tetromino_class.COLOUR)
+    tetromino_class.ROTATIONS = PIECE_TYPES[tetromino_class.SHAPE_ID].rotations
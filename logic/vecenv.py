@@ -0,0 +1,199 @@
+# File contains a vectorised environment that plays many games at once for AI training and evaluation
+# Every board is a row of int64 bitmasks in one NumPy array, so a step drops, locks and clears a piece
+# on all the boards together instead of one TetrisEngine at a time
+# The rules are the ones of TetrisEngine.place: an action is a (rotation, x) move from possible_moves,
+# rows are scored with the table used by remove_full_rows and a game with the same seed deals the same pieces
+# Needs NumPy, nothing in this file imports pygame
+
+import random
+from collections import namedtuple
+import numpy as np
+from logic.engine import ROW_CLEAR_SCORES
+from logic.randomiser import create_generator
+from logic.tetromino import PIECE_TYPES
+
+ROTATIONS = 4  # Spins an action can ask for, no shape has more distinct rotations
+SHAPE_ROWS = 5  # Pieces are compiled from 5x5 shapes, their cells are 0 to 4 rows above the piece's y_pos
+WALL = 2  # Columns of wall bits on the left of each row, a piece's cells reach 2 columns left of its x_pos
+TOP = SHAPE_ROWS  # Rows of empty space above the board, a piece locked one row too high still fits in them
+FLOOR = SHAPE_ROWS  # Full rows under the board, deep enough for a piece whose lowest cells are above its y_pos
+
+# Score for the number of rows cleared at once, the table remove_full_rows scores with
+SCORE_TABLE = np.array([ROW_CLEAR_SCORES[min(lines, 4)] for lines in range(SHAPE_ROWS + 1)], dtype=np.int64)
+
+# boards: (count, rows, cols) bools, current_pieces and next_pieces: shape ids (indices into PIECE_TYPES)
+VecObservation = namedtuple('VecObservation', ['boards', 'current_pieces', 'next_pieces'])
+
+
+def compile_masks(columns):
+    """
+    Return the row masks of every shape as an int64 array indexed by [shape id, spin, x, shape row].
+    Row i holds the cells i - 4 rows from the piece's y_pos, shifted to bit x + dx + WALL for a piece at x.
+    """
+    masks = np.zeros((len(PIECE_TYPES), ROTATIONS, columns, SHAPE_ROWS), dtype=np.int64)
+    for shape_id, piece_type in enumerate(PIECE_TYPES):
+        rotations = piece_type.rotations
+        for spin in range(ROTATIONS):
+            for dx, dy in rotations[spin % len(rotations)].cells:
+                for x in range(columns):
+                    masks[shape_id, spin, x, dy + SHAPE_ROWS - 1] |= 1 << (x + dx + WALL)
+    return masks
+
+
+def compile_distinct_spins():
+    """
+    Return which spins of every shape possible_moves tries, as bools indexed by [shape id, spin].
+    A shape only has its distinct rotations, so O has 1 spin and I, S and Z have 2.
+    """
+    distinct = np.zeros((len(PIECE_TYPES), ROTATIONS), dtype=bool)
+    for shape_id, piece_type in enumerate(PIECE_TYPES):
+        seen = set()
+        for spin, rotation in enumerate(piece_type.rotations[:ROTATIONS]):
+            cells = frozenset((dx - rotation.left, dy - rotation.top) for dx, dy in rotation.cells)
+            distinct[shape_id, spin] = cells not in seen
+            seen.add(cells)
+    return distinct
+
+
+class VecTetrisEnv:
+    """
+    Plays count games of the given board size at once.
+
+    Actions are indices rotation * (cols + 2) + x into the (rotation, x) moves of possible_moves.
+    legal_actions lists each place a piece can land once, like possible_moves, but step also takes
+    the other actions that land somewhere, e.g. a third rotation of I is the same as its first.
+    step takes one action per game and returns (observation, rewards, dones), rewards being the points scored.
+    A finished game, or one given an illegal action, stays done until it is reset.
+    """
+
+    def __init__(self, count, rows=20, cols=10, extended=False, generator='uniform', seed=None):
+        self.count = count
+        self.rows = rows
+        self.cols = cols
+        self.extended = extended
+        self.generator_name = generator
+        self.columns = cols + 2  # x positions tried by possible_moves
+        self.action_count = ROTATIONS * self.columns
+        self.spawn_x = cols // 2
+        self.masks = compile_masks(self.columns)
+        self.distinct_spins = compile_distinct_spins()
+
+        # Every row has wall bits on both sides, so walls collide like locked blocks
+        self.empty_row = ((1 << WALL) - 1) | (((1 << (WALL + 2)) - 1) << (cols + WALL))
+        self.full_row = (1 << (cols + 2 * WALL + 2)) - 1
+        self.seed_rng = random.Random(seed)  # Draws the seed of every game, so a run can be repeated
+
+        # TOP empty rows above the board and FLOOR full rows under it
+        self.boards = np.full((count, TOP + rows + FLOOR), self.empty_row, dtype=np.int64)
+        self.boards[:, TOP + rows:] = self.full_row
+        self.current_pieces = np.zeros(count, dtype=np.int64)
+        self.next_pieces = np.zeros(count, dtype=np.int64)
+        self.scores = np.zeros(count, dtype=np.int64)
+        self.lines_cleared = np.zeros(count, dtype=np.int64)
+        self.pieces_placed = np.zeros(count, dtype=np.int64)
+        self.dones = np.zeros(count, dtype=bool)
+        self.seeds = [0] * count  # A TetrisEngine with the seed of a game deals the same pieces
+        self.generators = [None] * count
+        self.reset()
+
+    def reset(self, indices=None):
+        """ Start new games on the given boards (every board by default) and return the observation. """
+        indices = range(self.count) if indices is None else indices
+        for k in indices:
+            seed = self.seeds[k] = self.seed_rng.randrange(2 ** 32)
+            generator = self.generators[k] = create_generator(self.generator_name, random.Random(seed), self.extended)
+            self.current_pieces[k] = generator.next()
+            self.next_pieces[k] = generator.next()
+            self.boards[k, :TOP + self.rows] = self.empty_row
+            self.scores[k] = self.lines_cleared[k] = self.pieces_placed[k] = 0
+            self.dones[k] = False
+        return self.observe()
+
+    def observe(self):
+        """ Return the boards as (count, rows, cols) bools with the current and next piece of every game. """
+        bits = self.boards[:, TOP:TOP + self.rows, None] >> (np.arange(self.cols) + WALL)
+        return VecObservation((bits & 1).astype(bool), self.current_pieces.copy(), self.next_pieces.copy())
+
+    def spins(self):
+        """
+        Return the spin every rotation ends on, as (count, ROTATIONS). Pieces are turned at their spawn position
+        before moving, and a turn that does not fit there leaves the piece at the spins before it.
+        """
+        window = self.boards[:, 1:1 + SHAPE_ROWS]  # Rows covered at y_pos 0
+        spawn_masks = self.masks[self.current_pieces, :, self.spawn_x]  # (count, ROTATIONS, SHAPE_ROWS)
+        fits = ~(window[:, None, :] & spawn_masks).any(axis=2)
+        fits[:, 0] = True  # The spawn rotation is never checked
+        blocked = np.where(fits.all(axis=1), ROTATIONS, (~fits).argmax(axis=1))
+        return np.minimum(np.arange(ROTATIONS), blocked[:, None] - 1)
+
+    def legal_actions(self):
+        """ Return a (count, action_count) mask of the moves possible_moves returns, none for done games. """
+        spins = self.spins()
+        masks = self.masks[self.current_pieces[:, None], spins]  # (count, ROTATIONS, columns, SHAPE_ROWS)
+        top_rows = self.boards[:, :1 + SHAPE_ROWS]  # Rows covered at y_pos -1 and 0
+        fits_top = ~(top_rows[:, None, None, 1:] & masks).any(axis=3)
+        fits_above = ~(top_rows[:, None, None, :-1] & masks).any(axis=3)
+        # A piece that fits in the top row drops to a legal position, one that does not has to fit one row higher
+        legal = fits_top | fits_above
+        # A rotation that is blocked at the spawn position or repeats an earlier one lands where another one does
+        legal &= ((spins == np.arange(ROTATIONS)) & self.distinct_spins[self.current_pieces])[:, :, None]
+        legal = legal.reshape(self.count, self.action_count)
+        legal[self.dones] = False
+        return legal
+
+    def step(self, actions):
+        """ Place the current piece of every game with its action and return (observation, rewards, dones). """
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.zeros(self.count, dtype=np.int64)
+        games = np.flatnonzero(~self.dones)
+        if not len(games):
+            return self.observe(), rewards, self.dones.copy()
+
+        rotation, x = np.divmod(actions[games], self.columns)
+        spins = self.spins()[games, rotation]
+        masks = self.masks[self.current_pieces[games], spins, x]  # (games, SHAPE_ROWS)
+        boards = self.boards[games]
+
+        # Same as landing_row: a piece that fits at y_pos 0 falls until it would collide, otherwise it stays at -1
+        y = np.zeros(len(games), dtype=np.int64)
+        falling = ~(boards[:, 1:1 + SHAPE_ROWS] & masks).any(axis=1)
+        legal = falling | ~(boards[:, :SHAPE_ROWS] & masks).any(axis=1)
+        y[~falling] = -1
+        rows = np.arange(SHAPE_ROWS)
+        while falling.any():
+            below = np.take_along_axis(boards, (y + 2)[:, None] + rows, axis=1)
+            falling &= ~(below & masks).any(axis=1)
+            y[falling] += 1
+
+        # An illegal action ends the game without placing the piece
+        self.dones[games[~legal]] = True
+        games, y, masks, boards = games[legal], y[legal], masks[legal], boards[legal]
+
+        # Lock the pieces, any cell above the board ends the game like Board.overflow
+        locked_rows = (y + 1)[:, None] + rows
+        np.put_along_axis(boards, locked_rows, np.take_along_axis(boards, locked_rows, axis=1) | masks, axis=1)
+        overflow = ((masks != 0) & (locked_rows < TOP)).any(axis=1)
+
+        # Clear full rows, moving the rows above them down in order
+        board_rows = boards[:, TOP:TOP + self.rows]
+        full = board_rows == self.full_row
+        lines = full.sum(axis=1)
+        clearing = np.flatnonzero(lines)
+        if len(clearing):
+            order = np.argsort(~full[clearing], axis=1, kind='stable')  # Full rows first, the rest keep their order
+            compacted = np.take_along_axis(board_rows[clearing], order, axis=1)
+            compacted[np.arange(self.rows) < lines[clearing, None]] = self.empty_row
+            board_rows[clearing] = compacted
+        self.boards[games] = boards
+
+        rewards[games] = SCORE_TABLE[lines]
+        self.scores[games] += rewards[games]
+        self.lines_cleared[games] += lines
+        self.pieces_placed[games] += 1
+        self.dones[games] = overflow | (board_rows[:, 0] != self.empty_row)
+
+        # Deal the next piece of every game that placed one
+        self.current_pieces[games] = self.next_pieces[games]
+        generators = self.generators
+        self.next_pieces[games] = [generators[k].next() for k in games.tolist()]
+        return self.observe(), rewards, self.dones.copy()
@@ -1,5 +1,5 @@
 # File contains the game logic for the controller
-# Defines game rules
+# The game rules themselves live in the headless engine in logic/engine.py
 # Defines actions based off of user input that has been received
 
 import sys
@@ -8,63 +8,18 @@ import random
 from abc import ABC, abstractmethod
 import logic.config as config
 from logic.tetromino import *
-
-def determine_level_easy(score):
-    if 0 <= score < 300:
-        return 0
-    elif 300 <= score < 1000:
-        return 1
-    elif 1000 <= score < 2000:
-        return 2
-    elif 2000 <= score < 4000:
-        return 3
-    elif 4000 <= score < 6000:
-        return 4
-    elif 6000 <= score < 8000:
-        return 5
-    elif 8000 <= score < 10000:
-        return 6
-    elif 10000 <= score < 15000:
-        return 7
-    elif 15000 <= score < 20000:
-        return 8
-    elif 20000 <= score < 25000:
-        return 9
-    else:
-        return 10
-
-def determine_level_hard(score):
-    if 0 <= score < 500:
-        return 5
-    elif 500 <= score < 1500:
-        return 6
-    elif 1500 <= score < 3000:
-        return 7
-    elif 3000 <= score < 5000:
-        return 8
-    elif 5000 <= score < 10000:
-        return 9
-    else:
-        return 10
+from logic.board import Board
+from logic.engine import *
+from logic.ai import *
+from logic.planner import AIPlanner
+from logic.fonts import get_font, font_cache_stats
+from logic.assets import assets
+from logic.scores import get_score_store
+from logic.profiler import PHASES, FRAME
 
 def update_score_file(filename, new_score, username):
-    try:
-        # Try to open the file and read the scores
-        with open(filename, 'r') as f:
-            scores = [line.strip().split(' ', 1) for line in f.readlines()]  # Read scores along with names
-            scores = [(int(score), name) for score, name in scores]  # Convert score to int
-    except FileNotFoundError:
-        # If the file does not exist, create an empty scores list
-        scores = []
-
-    # Append the new score and sort the list in descending order of scores
-    scores.append((new_score, username))
-    scores.sort(key=lambda x: x[0], reverse=True)  # Sort by score
-
-    # Write back the top 10 scores to the file
-    with open(filename, 'w') as f:
-        for score, name in scores[:10]:  # Keep only the top 10 scores
-            f.write(f"{score} {name}\n")
+    """ Add a score to the shared high score table of the file, which is written back atomically. """
+    get_score_store(filename).add(new_score, username)
 
 
 def input_box(surface, ai_mode=False):
@@ -74,7 +29,7 @@ def input_box(surface, ai_mode=False):
         surface.fill((30, 30, 30))
         pygame.draw.rect(surface, (200, 200, 200), (config.window_w // 4, config.window_h // 3, config.window_w // 2, config.window_h // 3))
 
-        font = pygame.font.SysFont('helvetica', 30)
+        font = get_font('helvetica', 30)
 
         # Render "High Score!" text
         text = font.render("High Score!", 1, (255, 255, 255))
@@ -111,113 +66,44 @@ def input_box(surface, ai_mode=False):
                 else:
                     user_name += event.unicode
 
-def initialize_game_state():
+def initialize_game_state(fast_game=False):
     """ Stores game variables for a new game session. """
     # Define initial game state variables
-    game_score = 0
-    game_level = 0
     time_since_last_fall = 0
     speed_of_fall = 0.3 # if statement from the first file
     time_since_level_up = 0
-    active_tetromino = fetch_random_tetromino()
-    upcoming_tetromino = fetch_random_tetromino()
+    game_engine = TetrisEngine(config.ROWS, config.COLS, extended=config.EXTENDED_GAME, fast=fast_game,
+                               generator=config.PIECE_GENERATOR)
     game_time = pygame.time.Clock()
     game_paused = False
-    need_to_change_tetromino = False
     game_running = True
-    locked_blocks_positions = {}
-
-    return (locked_blocks_positions, game_paused, need_to_change_tetromino, game_running , active_tetromino, upcoming_tetromino,
-            game_time, time_since_last_fall , speed_of_fall , time_since_level_up , game_score , game_level )
-
-def generate_game_grid(locked_pos=None):
-    if locked_pos is None:
-        locked_pos = {}
-    grid = [[config.EMPTY_CELL for _ in range(config.COLS)] for _ in range(config.ROWS)]
-    for row in range(config.ROWS):
-        for col in range(config.COLS):
-            if (col, row) in locked_pos:
-                colour = locked_pos[(col, row)]
-                grid[row][col] = colour
-    return grid
-
-
-
-
-def get_tetromino_positions(tetromino):
-    """ Converts the tetromino format to a list and creates it on the game grid. """
-    positions = []
-
-    # Determine the current rotation format of the tetromino
-    current_tetromino = tetromino.shape[tetromino.spin % len(tetromino.shape)]
-
-    # Iterate through each block in the current tetromino format
-    for i in range(len(current_tetromino)):
-        for j in range(len(current_tetromino[i])):
-            # If the block is an 'O', calculate its position on the grid
-            if current_tetromino[i][j] == 'O':
-                positions.append((tetromino.x_pos + j, tetromino.y_pos + i - 4))
-
-    # Adjust the positions to fit within the game grid
-    return [(x - 2, y) for x, y in positions]
-
-
-def is_position_valid(tetromino, grid):
-    """ Check if the given tetromino position is valid. """
-
-    accepted_positions = []
-
-    max_x = config.COLS - 1
-    max_y = config.ROWS - 1
-
-    # Collect all positions in the grid that are empty (unoccupied)
-    for i in range(config.ROWS):
-        for j in range(config.COLS):
-            if grid[i][j] == config.EMPTY_CELL:
-                accepted_positions.append((j, i))
-
-    # Convert the tetromino format to its positions on the grid
-    tetromino_positions = get_tetromino_positions(tetromino)
 
-    # Boundary Check
-    for pos in tetromino_positions:
-        x, y = pos
-        if x < 0 or x > max_x:
-            return False
-        if y > max_y:
-            return False
+    return (game_engine, game_paused, game_running, game_time, time_since_last_fall,
+            speed_of_fall, time_since_level_up)
 
-    # Collision Check
-    for position in tetromino_positions:
-        x, y = position
-        if y > -1 and position not in accepted_positions:
-            return False
+def generate_game_grid(board=None):
+    """ Return the colours of the locked blocks as a list of rows. """
+    if board is None:
+        return [[config.EMPTY_CELL for _ in range(config.COLS)] for _ in range(config.ROWS)]
+    return board.to_grid()
 
-    return True
 
 
 
-
-
-def is_game_over(positions):
-    """ Determine if any tetromino position is above the game grid. """
-    return any(pos[1] < 1 for pos in positions)
+def is_game_over(board):
+    """ Determine if any locked block has reached the top of the game grid. """
+    return board.is_game_over()
 
 
 def fetch_random_tetromino():
     """ Generate a random tetromino at the top-middle of the game grid. """
-    if config.EXTENDED_GAME:
-        TetrominoFactory.add_extended_tetrominoes()
-
-    tetromino_type = random.choice(list(TetrominoFactory.tetromino_classes.keys()))
-    spawn_x = config.COLS // 2  # This will roughly center the tetromino on the game board
-    return TetrominoFactory.create_tetromino(tetromino_type, spawn_x, 0)
+    return create_random_tetromino(random, config.COLS, config.EXTENDED_GAME)
 
 
 
 def render_centered_text(surface, text, size, colour):
     """ Render and draw a text in the middle of the game surface. """
-    font = pygame.font.SysFont("helvetica", size, bold=True)
+    font = get_font("helvetica", size, bold=True)
     text = font.render(text, 1, colour)
 
     # Calculate the position for the box
@@ -254,49 +140,25 @@ def render_game_grid(surface, grid):
     draw_horizontal_grid_lines(surface, config.window_x, config.window_y, end_y)
 
 
-def remove_full_rows(grid, locked, muted):
-    """ Clear full rows from the grid and update locked positions. """
-    rows_cleared = 0
-    rows_to_clear = []
-
-    # Identify full rows
-    for i, row in enumerate(reversed(grid)):
-        if not any(cell == config.EMPTY_CELL for cell in row):
-            rows_to_clear.append(len(grid) - 1 - i)
-
-    # Remove full rows from locked positions
-    for row_index in rows_to_clear:
-        rows_cleared += 1
-        for j in range(len(grid[0])):
-            locked.pop((j, row_index), None)
-
-    # Shift locked positions down
-    if rows_cleared:
-        if rows_cleared and not muted:
-            config.tiles_cleared_sound.play()
-        for (x, y), value in sorted(locked.items(), key=lambda item: item[0][1], reverse=True):
-            if y < rows_to_clear[-1]:
-                locked[(x, y + rows_cleared)] = locked.pop((x, y))
-
-    # Calculate score based on number of lines cleared
-    if rows_cleared == 1:
-        return 100
-    elif rows_cleared == 2:
-        return 300
-    elif rows_cleared == 3:
-        return 600
-    elif rows_cleared >= 4:
-        return 1000
-    else:
-        return 0
+def remove_full_rows(grid, board, muted):
+    """ Clear full rows from the board and shift the rows above them down. """
+    rows_cleared = board.clear_full_rows()
+
+    if rows_cleared and not muted:
+        assets.play_sound('tiles_cleared')
+
+    return score_cleared_rows(rows_cleared)
 
 
 
 def display_upcoming_piece(tetromino, surface):
     """ Display the next tetromino on the game surface. """
-    font = pygame.font.SysFont('helvetica', 30)
-    label = font.render('Next Tetromino', 1, (255, 255, 255))
+    display_upcoming_piece_blocks(tetromino, surface)
+    display_upcoming_piece_label(surface)
 
+
+def display_upcoming_piece_blocks(tetromino, surface):
+    """ Draw the blocks of the next tetromino. """
     # Get the current spin of the tetromino
     current_tetromino_spin = tetromino.shape[tetromino.spin % len(tetromino.shape)]
 
@@ -308,6 +170,12 @@ def display_upcoming_piece(tetromino, surface):
                 y_pos = 410 + i * config.tetromino_wh
                 pygame.draw.rect(surface, tetromino.colour, (x_pos, y_pos, config.tetromino_wh, config.tetromino_wh))
 
+
+def display_upcoming_piece_label(surface):
+    """ Draw the 'Next Tetromino' label above the next tetromino. """
+    font = get_font('helvetica', 30)
+    label = font.render('Next Tetromino', 1, (255, 255, 255))
+
     # Position and display the label
     label_position = (config.window_x + 510, config.window_y + 175)
     surface.blit(label, label_position)
@@ -316,22 +184,32 @@ def display_upcoming_piece(tetromino, surface):
 # SHOULD BE MOVED TO VIEW
 def render_game_window(surface, grid, score=0, level=0):
     """ Render the game window with the current state, score, and level. """
+    render_game_chrome(surface)
+
+    # Draw the tetrominoes on the grid
+    for i in range(len(grid)):
+        for j in range(len(grid[i])):
+            pygame.draw.rect(surface, grid[i][j], (config.window_x + j*config.tetromino_wh, config.window_y + i*config.tetromino_wh, config.tetromino_wh, config.tetromino_wh), 0)
+
+    # Draw the grid lines
+    render_game_grid(surface, grid)
+
+
+def render_game_chrome(surface):
+    """ Render the parts of the game window that do not change during a game. """
     # Set the background image
-    surface.blit(config.background_image, (0, 0))
+    surface.blit(assets.image('background'), (0, 0))
 
     # Draw the main game rectangle
     pygame.draw.rect(surface, (40, 40, 40), (config.window_x+470, config.window_y, 300, 600))
 
-    # Initialize font for text rendering
-    pygame.font.init()
-
     # Display game title
-    font = pygame.font.SysFont('helvetica', 60)
+    font = get_font('helvetica', 60)
     text = font.render('T e t r i s', 1, (255, 255, 255))
     surface.blit(text, (400, 40))
 
     # Display group name
-    font = pygame.font.SysFont('helvetica', 30)
+    font = get_font('helvetica', 30)
     text = font.render('Group 19', 1, (255, 255, 255))
     surface.blit(text, (50, 40))
 
@@ -367,51 +245,164 @@ def render_game_window(surface, grid, score=0, level=0):
         text = font.render('Speed: Slow', 1, (255, 255, 255))
         surface.blit(text, (config.window_x+510, config.window_y+125))
 
-    # Draw the tetrominoes on the grid
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            pygame.draw.rect(surface, grid[i][j], (config.window_x + j*config.tetromino_wh, config.window_y + i*config.tetromino_wh, config.tetromino_wh, config.tetromino_wh), 0)
-
-    # Draw the grid lines
-    render_game_grid(surface, grid)
-
 
-def shift_piece(current_piece, grid, direction):
+class GameRenderer:
     """
-    Move the current tetromino piece in the specified direction.
+    Draws the game window by only redrawing what changed since the last frame.
 
-    Parameters:
-    - current_piece: The tetromino piece to move.
-    - grid: Current game grid.
-    - direction: The direction to move the piece ("LEFT", "RIGHT", "DOWN", "ROTATE").
+    The background, titles and game mode labels are drawn once into a cached chrome layer.
+    Each frame the grid is compared with the previous one and only the changed cells are drawn.
+    Everything drawn is collected as dirty rectangles for pygame.display.update.
     """
-    # Move the piece to the left
-    if direction == "LEFT":
-        current_piece.x_pos -= 1
-        if not is_position_valid(current_piece, grid):  # Check if the move is valid
-            current_piece.x_pos += 1
-
-    # Move the piece to the right
-    elif direction == "RIGHT":
-        current_piece.x_pos += 1
-        if not is_position_valid(current_piece, grid):  # Check if the move is valid
-            current_piece.x_pos -= 1
-
-    # Move the piece downwards
-    elif direction == "DOWN":
-        current_piece.y_pos += 1
-        if not is_position_valid(current_piece, grid):  # Check if the move is valid
-            current_piece.y_pos -= 1
-
-    # Rotate the piece
-    elif direction == "ROTATE":
-        current_piece.spin += 1
-        if not is_position_valid(current_piece, grid):  # Check if the rotation is valid
-            current_piece.spin -= 1
-
-
-def process_quit_events(paused, run, score, window_size):
-    """ Handle events during the game's pause state. """
+    grid_colour = (128, 128, 128)
+    preview_rect = pygame.Rect(680, 410, 5 * config.tetromino_wh, 5 * config.tetromino_wh)
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.chrome = None
+        self.overlay = None  # Surface drawn over everything else, such as the profiler overlay
+        self.overlay_rect = None
+        self.invalidate()
+
+    def invalidate(self):
+        """ Redraw the whole window on the next frame, e.g. after a dialog was drawn over the game. """
+        self.last_grid = None
+        self.last_preview = None
+        self.labels = {}  # position -> (text, rect) of the labels drawn with draw_text
+        self.dirty = []
+
+    def build_chrome(self):
+        self.chrome = pygame.Surface(self.surface.get_size()).convert()
+        render_game_chrome(self.chrome)
+        display_upcoming_piece_label(self.chrome)
+
+    def cell_rect(self, row, col):
+        return pygame.Rect(config.window_x + col * config.tetromino_wh, config.window_y + row * config.tetromino_wh,
+                           config.tetromino_wh, config.tetromino_wh)
+
+    def draw_cell(self, row, col, colour):
+        rect = self.cell_rect(row, col)
+        pygame.draw.rect(self.surface, colour, rect, 0)
+        # The outline is one pixel larger so it lands on the same lines as render_game_grid
+        pygame.draw.rect(self.surface, self.grid_colour, (rect.x, rect.y, rect.w + 1, rect.h + 1), 1)
+        return rect
+
+    def render(self, grid, next_piece, rows=None):
+        """
+        Draw the grid and the next tetromino, only where they changed since the last frame.
+        rows limits the comparison to the rows that may have changed, None compares every row.
+        """
+        if self.chrome is None:
+            self.build_chrome()
+
+        if self.last_grid is None:
+            # Full redraw
+            self.surface.blit(self.chrome, (0, 0))
+            for row in range(len(grid)):
+                for col in range(len(grid[row])):
+                    self.draw_cell(row, col, grid[row][col])
+            self.dirty = [self.surface.get_rect()]
+            self.labels = {}
+            self.last_grid = [row.copy() for row in grid]
+        else:
+            if rows is None:
+                rows = range(len(grid))
+            last_grid = self.last_grid
+            changed = []
+            for row in rows:
+                cells, last_cells = grid[row], last_grid[row]
+                if cells != last_cells:
+                    changed.extend(self.draw_cell(row, col, colour)
+                                   for col, colour in enumerate(cells) if colour != last_cells[col])
+                    last_grid[row] = cells.copy()
+            if changed:
+                area = changed[0].unionall(changed)
+                self.dirty.append(pygame.Rect(area.x, area.y, area.w + 1, area.h + 1))  # + 1 for the outline
+
+        # The preview only changes when a new piece spawns
+        preview = next_piece.state()[:2]  # (shape id, spin)
+        if preview != self.last_preview:
+            self.surface.blit(self.chrome, self.preview_rect, self.preview_rect)
+            display_upcoming_piece_blocks(next_piece, self.surface)
+            self.dirty.append(self.preview_rect)
+            self.last_preview = preview
+
+    def draw_text(self, font, text, position, colour=(255, 255, 255)):
+        """ Draw a label such as the score, restoring the chrome under the old text first. """
+        if self.chrome is None:
+            self.build_chrome()
+        previous = self.labels.get(position)
+        if previous is not None and previous[0] == text:
+            return
+
+        label = font.render(text, 1, colour)
+        rect = label.get_rect(topleft=position)
+        area = rect.union(previous[1]) if previous is not None else rect
+        self.surface.blit(self.chrome, area, area)
+        self.surface.blit(label, rect)
+        self.labels[position] = (text, rect)
+        self.dirty.append(area)
+
+    def set_overlay(self, overlay, position=(10, 10)):
+        """ Draw overlay over the game until it is replaced, None removes it and redraws what it covered. """
+        if overlay is None:
+            if self.overlay is not None:
+                self.overlay = None
+                self.invalidate()
+            return
+        rect = overlay.get_rect(topleft=position)
+        if self.overlay_rect is not None and self.overlay is not None and not rect.contains(self.overlay_rect):
+            self.invalidate()  # The new overlay does not cover the old one
+        self.overlay = overlay
+        self.overlay_rect = rect
+        self.dirty.append(rect)
+
+    def has_pending_changes(self):
+        """ True when a full redraw is due or something was drawn that has not been sent to the display. """
+        return self.last_grid is None or bool(self.dirty)
+
+    def flush(self):
+        """ Return the rectangles drawn since the last call, ready for pygame.display.update. """
+        if self.overlay is not None and self.dirty:
+            # Anything drawn this frame may be under the overlay, so it is drawn again on top
+            self.surface.blit(self.overlay, self.overlay_rect)
+            self.dirty.append(self.overlay_rect)
+        dirty, self.dirty = self.dirty, []
+        return dirty
+
+
+def render_profiler_hud(profiler, notes=()):
+    """ Draw the rolling percentiles of every phase of the frame profiler, in milliseconds, on a new panel. """
+    # The numbers change every time, so the text is rendered by the pygame font without the shared text cache
+    font = get_font(None, 18).font
+    summary = profiler.summary()
+    header = ['ms', 'p50', 'p95', 'p99', 'max']
+    table = [header] + [[phase] + [f"{summary[phase][column]:.2f}" for column in header[1:]]
+                        for phase in PHASES + (FRAME,)]
+    lines = [f"Frame profiler, last {len(profiler.history[FRAME])} frames (F3)"] + list(notes)
+
+    # Every cell is drawn on its own so the columns line up whatever font is used
+    line_height = font.get_linesize()
+    name_width = max(font.size(row[0])[0] for row in table) + 10
+    number_width = font.size('0000.00')[0] + 10
+    width = max([name_width + 4 * number_width] + [font.size(line)[0] for line in lines]) + 12
+    panel = pygame.Surface((width, (len(table) + len(lines)) * line_height + 8))
+    panel.fill((20, 20, 20))
+    colour = (255, 255, 255)
+    panel.blit(font.render(lines[0], True, colour), (6, 4))
+    for i, row in enumerate(table, 1):
+        y = 4 + i * line_height
+        panel.blit(font.render(row[0], True, colour), (6, y))
+        for column, text in enumerate(row[1:], 1):
+            label = font.render(text, True, colour)
+            panel.blit(label, (6 + name_width + column * number_width - label.get_width(), y))
+    for i, line in enumerate(lines[1:], len(table) + 1):
+        panel.blit(font.render(line, True, colour), (6, 4 + i * line_height))
+    return panel
+
+
+def process_quit_events(paused, run):
+    """ Handle events during the game's pause state, the caller saves the score of a game that was quit. """
     for pause_event in pygame.event.get():
         # Check for game exit event
         if pause_event.type == pygame.QUIT:
@@ -430,30 +421,6 @@ def process_quit_events(paused, run, score, window_size):
             # Check if "Yes" button is clicked
             elif config.window_w // 2 - 50 <= x <= config.window_w // 2 + 100 and config.window_h // 2 <= y <= config.window_h // 2 + 50:
                 run = False
-                score_filename = 'scores.txt'
-
-                # Try to load existing scores.
-                try:
-                    with open(score_filename, 'r') as file:
-                        scores = [int(line.strip().split(' ', 1)[0]) for line in file.readlines()]
-                except FileNotFoundError:
-                    scores = []
-
-                # Check if the player's score is a top 10 score.
-                if not scores or len(scores) < 10 or score > min(scores):  # Use score directly
-                    if config.AI_ENABLED:
-                        username = input_box(window_size, ai_mode=True)  # Use window_size directly
-                        update_score_file(score_filename, score, username,)
-                    else:
-                        username = input_box(window_size)  # Use window_size directly
-                        update_score_file(score_filename, score, username)  # Use score directly
-                else:
-                    # If the player's score is not a top 10 score,
-                    # you might want to display a message or do something else here.
-                    pass
-                #pygame.quit()
-                #sys.exit()
-                #return run, paused
                 pygame.event.clear()  # Clear the event queue
                 return run, paused
 
@@ -466,7 +433,7 @@ def render_quit_dialog(surface):
     pygame.draw.rect(surface, (200, 200, 200), (config.window_w // 4, config.window_h // 3, config.window_w // 2, config.window_h // 3))
 
     # Display the question text
-    font = pygame.font.SysFont('helvetica', 30)
+    font = get_font('helvetica', 30)
     text = font.render("Do you want to quit?", 1, (0, 0, 0))
     surface.blit(text, (config.window_w // 4 + 50, config.window_h // 3 + 30))
 
@@ -483,7 +450,7 @@ def render_pause_dialog(surface):
     """ Creates a dialog box during the game's pause state. """
     pygame.draw.rect(surface, (200, 200, 200), (config.window_w // 4, config.window_h // 3, config.window_w // 2, config.window_h // 3))
 
-    font = pygame.font.SysFont('helvetica', 30)
+    font = get_font('helvetica', 30)
     text = font.render("Game Paused", 1, (0, 0, 0))
     surface.blit(text, (config.window_w // 4 + 50, config.window_h // 3 + 30))
 
@@ -533,13 +500,17 @@ class Observer(ABC):
 
 
 class ScoreObserver(Observer):
-    def __init__(self, surface):
+    def __init__(self, surface, renderer=None):
         """Initializes the ScoreObserver with a surface to render text on"""
         self.surface = surface
-        self.font = pygame.font.SysFont('helvetica', 30)  # Initialize the font once
+        self.renderer = renderer  # When set, the renderer redraws the text only when it changes
+        self.font = get_font('helvetica', 30)
 
     def update(self, observable):
         score = observable.score
+        if self.renderer is not None:
+            self.renderer.draw_text(self.font, 'Score: ' + str(score), (config.window_x+510, config.window_y+450))
+            return
         text = self.font.render('Score: ' + str(score), 1, (255, 255, 255))
         text_rect = text.get_rect(topleft=(config.window_x+510, config.window_y+450))
 
@@ -550,13 +521,17 @@ class ScoreObserver(Observer):
 
 
 class LevelObserver(Observer):
-    def __init__(self, surface):
+    def __init__(self, surface, renderer=None):
         """Initializes the LevelObserver with a surface to render text on"""
         self.surface = surface
-        self.font = pygame.font.SysFont('helvetica', 30)  # Initialize the font once
+        self.renderer = renderer  # When set, the renderer redraws the text only when it changes
+        self.font = get_font('helvetica', 30)
 
     def update(self, observable):
         level = observable.level
+        if self.renderer is not None:
+            self.renderer.draw_text(self.font, 'Current Level: ' + str(level), (config.window_x + 510, config.window_y + 490))
+            return
         text = self.font.render('Current Level: ' + str(level), 1, (255, 255, 255))
         text_rect = text.get_rect(topleft=(config.window_x + 510, config.window_y + 490))
 
@@ -564,76 +539,3 @@ class LevelObserver(Observer):
         #self.surface.fill((0, 0, 0), text_rect)
 
         self.surface.blit(text, text_rect.topleft)
-
-
-def is_move_valid(move, piece, grid):
-    rotation, x_position = move
-    test_piece = piece.copy()
-
-    for _ in range(rotation):
-        shift_piece(test_piece, grid, "ROTATE")
-
-    test_piece.x_pos = x_position
-    test_piece.y_pos = 0
-
-    while is_position_valid(test_piece, grid):
-        test_piece.y_pos += 1
-    test_piece.y_pos -= 1
-
-    return is_position_valid(test_piece, grid)
-
-
-def possible_moves(piece, grid):
-    moves = [(rotation, x) for rotation in range(4) for x in range((config.window_w // 30) - piece.width())]
-    return [move for move in moves if is_move_valid(move, piece, grid)]
-
-
-def evaluate_board(board, weights):
-    a, b, c, d = weights
-    completed_lines = sum(1 for row in board if all(cell != (0, 0, 0) for cell in row))
-    filled_cells_y = [y for y, row in enumerate(board) if any(cell != (0, 0, 0) for cell in row)]
-    board_height = max(filled_cells_y) - min(filled_cells_y) + 1 if filled_cells_y else 0
-    holes = sum(1 for col in zip(*board) for i, cell in enumerate(col) if
-                cell == (0, 0, 0) and any(x != (0, 0, 0) for x in col[:i]))
-    column_heights = [max([i for i, cell in enumerate(col) if cell != (0, 0, 0)], default=0) for col in zip(*board)]
-    bumpiness = sum(abs(column_heights[i] - column_heights[i + 1]) for i in range(len(column_heights) - 1))
-
-    # Print out the individual components for debugging
-    print(f"Completed Lines: {completed_lines}")
-    print(f"Board Height: {board_height}")
-    print(f"Holes: {holes}")
-    print(f"Bumpiness: {bumpiness}")
-
-    return a * completed_lines - b * board_height - c * holes - d * bumpiness
-
-
-
-def best_move(current_piece, grid, weights):
-    moves = possible_moves(current_piece, grid)
-    if not moves:
-        return None
-
-    evaluations = {}
-    for move in moves:
-        test_piece = current_piece.copy()
-        test_grid = [row.copy() for row in grid]
-
-        rotation, x_position = move
-        for _ in range(rotation):
-            shift_piece(test_piece, test_grid, "ROTATE")
-        test_piece.x_pos = x_position
-
-        while is_position_valid(test_piece, test_grid):
-            test_piece.y_pos += 1
-        test_piece.y_pos -= 1
-
-        shape_positions = get_tetromino_positions(test_piece)
-        for pos in shape_positions:
-            x, y = pos
-            if y > -1:
-                test_grid[y][x] = test_piece.colour
-
-        evaluations[move] = evaluate_board(test_grid, weights)
-
-    best_evaluation_move = max(evaluations, key=evaluations.get)
-    return best_evaluation_move
@@ -0,0 +1,10 @@
+# Settings shared by the tests
+# Run from the project folder: python -m pytest tests
+# pygame runs on its dummy video and audio drivers, so the tests need no display or sound card
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
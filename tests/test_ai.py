@@ -0,0 +1,36 @@
+# Tests for the AI move generators
+
+import random
+
+import pytest
+
+from logic.ai import legal_placements
+from logic.board import Board
+from logic.engine import TetrisEngine, get_tetromino_positions
+from logic.randomiser import piece_names, shape_id
+from logic.tetromino import Tetromino
+
+
+def build_board(rows, cols, rng):
+    """ Fill the bottom half of the board with random blocks, leaving a gap in every row. """
+    board = Board(rows, cols)
+    for y in range(rows // 2, rows):
+        gap = rng.randrange(cols)
+        board.lock([(x, y) for x in range(cols) if x != gap and rng.random() < 0.7], (128, 128, 128))
+    return board
+
+
+@pytest.mark.parametrize('spin', [1, 2, 3])
+@pytest.mark.parametrize('name', piece_names(True))
+def test_moves_of_a_rotated_piece_turn_from_its_spin(name, spin):
+    board = build_board(20, 10, random.Random(f"{name}-{spin}"))
+    engine = TetrisEngine(20, 10, extended=True, seed=19)
+
+    placements = legal_placements(Tetromino(shape_id(name), 5, 0, spin), board)
+    assert placements
+    for (rotation, x_position), positions in placements:
+        # TetrisEngine.place turns the piece rotation times from the spin it already has
+        engine.board = board.copy()
+        piece = engine.current_piece = Tetromino(shape_id(name), 5, 0, spin)
+        assert engine.place(rotation, x_position) is not None
+        assert get_tetromino_positions(piece) == positions
@@ -0,0 +1,51 @@
+# Tests for watching recorded games in the game window
+
+import pygame
+import pytest
+
+import logic.config as config
+from controller import watch_replay
+from logic.ai import lookahead_move
+from logic.engine import TetrisEngine
+from logic.replay import ReplayRecorder, matches, save_replay
+
+WEIGHTS = [1000, 500, 100, 300]
+
+
+@pytest.fixture
+def default_config(monkeypatch):
+    """ Start from the default board and mode, and put back whatever watch_replay changed afterwards. """
+    for name in ('ROWS', 'COLS', 'LARGE_BOARD', 'SMALL_BOARD', 'EXTENDED_GAME', 'FAST_GAME', 'PIECE_GENERATOR'):
+        monkeypatch.setattr(config, name, getattr(config, name))
+    config.ROWS, config.COLS = 20, 10
+    config.LARGE_BOARD = config.SMALL_BOARD = config.EXTENDED_GAME = config.FAST_GAME = False
+    monkeypatch.setattr(config, 'RECORD_REPLAYS', False)
+    pygame.display.init()
+    pygame.font.init()
+    yield
+    pygame.display.quit()
+
+
+def record_game(rows, cols, extended, pieces=30):
+    """ Play a seeded AI game on the given board and return its replay. """
+    engine = TetrisEngine(rows, cols, extended, seed=19, generator='bag')
+    engine.recorder = ReplayRecorder(engine, config.SIMULATION_STEP)
+    while not engine.game_over and engine.pieces_placed < pieces:
+        placement = lookahead_move(engine.current_piece, engine.next_piece, engine.board, WEIGHTS, table=None)
+        engine.play_path(placement.path)
+    return engine.recorder.replay()
+
+
+@pytest.mark.parametrize('rows, cols, large, small', [(16, 8, False, True), (20, 15, True, False)])
+def test_watch_replay_uses_recorded_board(tmp_path, default_config, rows, cols, large, small):
+    replay = record_game(rows, cols, extended=True)
+    filename = str(tmp_path / 'game.replay')
+    save_replay(filename, replay)
+
+    engine = watch_replay(filename, speed=1e9)
+
+    assert matches(replay, engine)
+    # The grid lines and mode labels are drawn from config, which now describes the recorded game
+    assert (config.ROWS, config.COLS) == (rows, cols)
+    assert (config.LARGE_BOARD, config.SMALL_BOARD) == (large, small)
+    assert config.EXTENDED_GAME and config.PIECE_GENERATOR == 'bag'
@@ -1,11 +1,12 @@
 import pygame
 from controller import *
 import logic.config as config
+from logic.fonts import get_font
+from logic.assets import assets
+from logic.scores import get_score_store
+from logic.history import Mode, get_score_history, mode_label
 
 
-# Initialize Pygame
-pygame.init()
-
 # Constants
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 800
@@ -13,12 +14,10 @@ FONT_SIZE = 36
 BUTTON_COLOR = (100, 100, 100)
 BUTTON_TEXT_COLOR = (255, 255, 255)
 
-# Create the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Tetris Start Screen")
-
-# Create a font
-font = pygame.font.Font(None, FONT_SIZE)
+# The screen and fonts are created by init_view() so importing this file does not open a window
+screen = None
+font = None
+fancy_font = None
 
 # Define buttons
 play_button = pygame.Rect(400, 200, 200, 50)  # 'Play' button
@@ -28,6 +27,13 @@ configure_button = pygame.Rect(400, 320, 200, 50)  # 'Configure' button
 
 back_button = pygame.Rect(20, 20, 80, 40)  # 'Back' button
 
+# Score screen buttons
+previous_mode_button = pygame.Rect(60, 110, 50, 40)  # '<' button, shows the leaderboard of the previous mode
+next_mode_button = pygame.Rect(890, 110, 50, 40)  # '>' button
+previous_page_button = pygame.Rect(200, 690, 120, 50)  # 'Prev' button
+next_page_button = pygame.Rect(680, 690, 120, 50)  # 'Next' button
+SCORES_PER_PAGE = 10
+
 # Configuration options
 config_options = {
     "Game Mode": ["Normal Game", "Game with Extension"],
@@ -46,32 +52,87 @@ selected_config = {
 
 
 def read_top_10_players_from_file(filename):
-    with open(filename, 'r') as file:
-        # Read each line, split it, and store player and score
-        players = [(line.split()[1], int(line.split()[0])) for line in file.readlines()]
-
-        # Sort players based on score in descending order
-        players.sort(key=lambda x: x[1], reverse=True)
-
-        # Take top 10 players
-        top_10_players = players[:10]
-
-    return top_10_players
-
-# Read from scores.txt
-top_10_players = read_top_10_players_from_file('scores.txt')
-print(top_10_players)
-
-# Load the fancy font
-fancy_font = pygame.font.Font("YoungSerif-Regular.ttf", 22)
+    # The table is shared with the game, so a score added at game over shows up straight away
+    return get_score_store(filename).top(10)
+
+# Read from scores.txt each time the score screen is opened
+top_10_players = []
+
+
+def refresh_top_10_players():
+    global top_10_players
+    top_10_players = read_top_10_players_from_file('scores.txt')
+
+
+# The score screen shows one page of the score history of one mode at a time
+# Only the page on screen is read from the database, when the screen opens or a button changes the page
+score_modes = []  # Modes that have games in the history
+score_mode_index = 0
+score_page = 0
+score_page_count = 1
+score_page_games = []
+
+
+def open_score_screen():
+    """ Start the score screen on the first page of the mode the game is set to. """
+    global score_modes, score_mode_index, score_page
+    refresh_top_10_players()
+    score_modes = [mode for mode, _ in get_score_history(config.SCORE_HISTORY_FILE).modes()]
+    current_mode = Mode(config.ROWS, config.COLS, config.EXTENDED_GAME, config.FAST_GAME, config.AI_ENABLED)
+    score_mode_index = score_modes.index(current_mode) if current_mode in score_modes else 0
+    score_page = 0
+    load_score_page()
+
+
+def change_score_page(page_step=0, mode_step=0):
+    """ Move to another page or, going round the modes, to another mode's leaderboard. """
+    global score_mode_index, score_page
+    if not score_modes:
+        return
+    if mode_step:
+        score_mode_index = (score_mode_index + mode_step) % len(score_modes)
+        score_page = 0
+    else:
+        score_page = min(max(score_page + page_step, 0), score_page_count - 1)
+    load_score_page()
+
+
+def load_score_page():
+    global score_page_count, score_page_games
+    if not score_modes:
+        score_page_count, score_page_games = 1, []
+        return
+    history = get_score_history(config.SCORE_HISTORY_FILE)
+    mode = score_modes[score_mode_index]
+    score_page_count = max(1, -(-history.count(mode) // SCORES_PER_PAGE))
+    score_page_games = history.top(mode, SCORES_PER_PAGE, score_page * SCORES_PER_PAGE)
+
+
+def draw_button(button, label):
+    pygame.draw.rect(screen, BUTTON_COLOR, button)
+    text = font.render(label, True, BUTTON_TEXT_COLOR)
+    screen.blit(text, text.get_rect(center=button.center))
+
+
+def init_view():
+    """ Open the window and load the fonts, then load the images and sounds in the background. """
+    global screen, font, fancy_font
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tetris Start Screen")
+
+    # Create the fonts
+    font = get_font(None, FONT_SIZE)
+    fancy_font = get_font("YoungSerif-Regular.ttf", 22)
+
+    # The first frame only needs the page background, everything else is loaded while it is shown
+    assets.preload(background=True)
 
 user_control_button = pygame.Rect(300, 380, 200, 50)  # 'User Control' button
 def draw_start_screen():
-    # Load the background image
-    background_image = pygame.image.load("game_page_background.jpg")
-
     # Blit the background image
-    screen.blit(background_image, (0, 0))
+    screen.blit(assets.image('page_background'), (0, 0))
 
     # Define dark blue color
     dark_blue = (0, 0, 139)  # RGB values for dark blue
@@ -160,24 +221,44 @@ def draw_start_screen():
 
 
 def draw_score_screen():
-    # Load the high score background image
-    high_score_background = pygame.image.load("game_page_background.jpg")  # Update the path to your background image
-
     # Blit the background image
-    screen.blit(high_score_background, (0, 0))
-
-    # Calculate the total height of the top 10 players section
-    total_height = len(top_10_players) * FONT_SIZE
-
-    # Calculate the vertical position to center the top 10 players
-    y_offset = (SCREEN_HEIGHT - total_height) // 2
-
-    # Display top 10 players
-    for i, (player, score) in enumerate(top_10_players, 1):
-        player_text = font.render(f"{i}. {player} - {score}", True, BUTTON_TEXT_COLOR)
-        player_rect = player_text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
-        screen.blit(player_text, player_rect)
-        y_offset += FONT_SIZE
+    screen.blit(assets.image('page_background'), (0, 0))
+
+    if score_modes:
+        # Name of the mode and the buttons to switch to the other modes
+        mode_text = fancy_font.render(mode_label(score_modes[score_mode_index]), True, BUTTON_TEXT_COLOR)
+        screen.blit(mode_text, mode_text.get_rect(center=(SCREEN_WIDTH // 2, previous_mode_button.centery)))
+        draw_button(previous_mode_button, "<")
+        draw_button(next_mode_button, ">")
+
+        # Display the games of this page
+        y_offset = 200
+        first_rank = score_page * SCORES_PER_PAGE + 1
+        for rank, game in enumerate(score_page_games, first_rank):
+            game_text = font.render(f"{rank}. {game.name} - {game.score} ({game.lines} lines)", True,
+                                    BUTTON_TEXT_COLOR)
+            screen.blit(game_text, game_text.get_rect(center=(SCREEN_WIDTH // 2, y_offset)))
+            y_offset += FONT_SIZE + 8
+
+        # Page buttons
+        page_text = font.render(f"Page {score_page + 1} of {score_page_count}", True, BUTTON_TEXT_COLOR)
+        screen.blit(page_text, page_text.get_rect(center=(SCREEN_WIDTH // 2, previous_page_button.centery)))
+        draw_button(previous_page_button, "Prev")
+        draw_button(next_page_button, "Next")
+    else:
+        # No game has been recorded in the history yet, so show the top 10 of scores.txt
+        # Calculate the total height of the top 10 players section
+        total_height = len(top_10_players) * FONT_SIZE
+
+        # Calculate the vertical position to center the top 10 players
+        y_offset = (SCREEN_HEIGHT - total_height) // 2
+
+        # Display top 10 players
+        for i, (player, score) in enumerate(top_10_players, 1):
+            player_text = font.render(f"{i}. {player} - {score}", True, BUTTON_TEXT_COLOR)
+            player_rect = player_text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
+            screen.blit(player_text, player_rect)
+            y_offset += FONT_SIZE
 
     # Draw the 'Back' button
     pygame.draw.rect(screen, BUTTON_COLOR, back_button)
@@ -192,11 +273,8 @@ def draw_score_screen():
 def draw_configure_screen():
     global AI_ENABLED, FAST_GAME, EXTENDED_GAME, LARGE_BOARD, SMALL_BOARD, ROWS, COLS
 
-    # Load the configure page background image
-    configure_page_background = pygame.image.load("game_page_background.jpg")  # Update the path to your background image
-
     # Blit the background image
-    screen.blit(configure_page_background, (0, 0))
+    screen.blit(assets.image('page_background'), (0, 0))
 
     # Define the y-offset for rendering options
     y_offset = 150
@@ -264,7 +342,7 @@ def draw_user_control_screen():
 
     # Define the smaller font
     SMALL_FONT_SIZE = 18
-    small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
+    small_font = get_font(None, SMALL_FONT_SIZE)
 
     # Draw the user manual title with a fancy font
     user_manual_title = fancy_font.render("Tetris Game User Manual", True, sky_blue)
@@ -302,13 +380,10 @@ def draw_user_control_screen():
 
 
 
-# ... (previous code)
-
-# Load the background image
-background_image = pygame.image.load("game_page_background.jpg")
-
 # Define the main function
 def main():
+    init_view()
+
     running = True
     show_score_screen = False
     show_configure_screen = False
@@ -327,6 +402,7 @@ def main():
                     elif play_button.collidepoint(event.pos):
                         play()
                     elif score_button.collidepoint(event.pos):
+                        open_score_screen()
                         show_score_screen = True
                         show_start_screen = False
                     elif configure_button.collidepoint(event.pos):
@@ -341,6 +417,14 @@ def main():
                     if back_button.collidepoint(event.pos):
                         show_score_screen = False
                         show_start_screen = True
+                    elif previous_page_button.collidepoint(event.pos):
+                        change_score_page(page_step=-1)
+                    elif next_page_button.collidepoint(event.pos):
+                        change_score_page(page_step=1)
+                    elif previous_mode_button.collidepoint(event.pos):
+                        change_score_page(mode_step=-1)
+                    elif next_mode_button.collidepoint(event.pos):
+                        change_score_page(mode_step=1)
 
             elif show_configure_screen:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -358,7 +442,6 @@ def main():
         screen.fill((0, 0, 0))
 
         if show_start_screen:
-            screen.blit(background_image, (0, 0))
             draw_start_screen()
         elif show_score_screen:
             draw_score_screen()